@@ -1,6 +1,6 @@
 {
     'name': 'EDDE Course Management',
-    'version': '2.0',
+    'version': '2.5',
     'summary': 'Course and Registration Management for EDDE',
     'description': """
         This module provides management capabilities for courses and student registrations.
@@ -12,12 +12,22 @@
     'data': [
         'security/ir.model.access.csv',
         'data/sequence_data.xml',
+        'data/course_group_data.xml',
+        'data/crm_lead_data.xml',
+        'data/mail_template_data.xml',
+        'data/ir_cron_data.xml',
         'views/course_registration_views.xml',
         'views/course_config_views.xml',
+        'wizard/course_registration_import_wizard_views.xml',
+        'wizard/course_group_enroll_wizard_views.xml',
         'views/course_group_views.xml',
         'views/group_member_payment_views.xml',
+        'views/group_member_installment_views.xml',
         'views/teacher_salary_views.xml',
         'views/res_partner_views.xml',
+        'report/course_attendance_report_views.xml',
+        'report/course_receivable_aging_views.xml',
+        'wizard/teacher_conflict_wizard_views.xml',
     ],
     'demo': [],
     'installable': True,
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from werkzeug.exceptions import NotFound
+
+from odoo import http
+from odoo.http import request
+
+
+class EddeAttendanceController(http.Controller):
+    """Sinif planşetləri üçün yüngül devamiyyət API-si"""
+
+    def _get_lesson_day(self, lesson_day_id):
+        lesson_day = request.env['course.group.lesson.day'].browse(lesson_day_id).exists()
+        if not lesson_day:
+            raise NotFound()
+        return lesson_day
+
+    @http.route('/edde/lesson_day/<int:lesson_day_id>/attendance', type='json', auth='user')
+    def attendance_sheet(self, lesson_day_id):
+        """Dərsin devamiyyət siyahısı: [{member_id, name, is_present}, ...]"""
+        return self._get_lesson_day(lesson_day_id)._get_attendance_sheet()
+
+    @http.route('/edde/lesson_day/<int:lesson_day_id>/roll_call', type='json', auth='user', methods=['POST'])
+    def roll_call(self, lesson_day_id, present_member_ids):
+        """Yoxlamanı tətbiq et və yenilənmiş siyahını qaytar"""
+        return self._get_lesson_day(lesson_day_id).set_roll_call(present_member_ids)
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Unikal (lesson_day_id, student_id) indeksindən əvvəl təkrar devamiyyət qeydlərini sil"""
+    if not version:
+        return
+    cr.execute("""
+        DELETE FROM course_lesson_attendance a
+              USING course_lesson_attendance b
+              WHERE a.lesson_day_id = b.lesson_day_id
+                AND a.student_id = b.student_id
+                AND a.id > b.id
+    """)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Qrup statistikası sahələrini SQL ilə doldur.
+
+    Sütunlar ORM-dən əvvəl yaradılır ki, yeniləmə zamanı bütün qruplar üçün
+    hesablanmış sahələr Python-da yenidən hesablanmasın.
+    """
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE course_group
+            ADD COLUMN IF NOT EXISTS member_count int4,
+            ADD COLUMN IF NOT EXISTS active_member_count int4,
+            ADD COLUMN IF NOT EXISTS total_monthly_payment float8,
+            ADD COLUMN IF NOT EXISTS lesson_day_count int4,
+            ADD COLUMN IF NOT EXISTS lessons_with_teacher_count int4,
+            ADD COLUMN IF NOT EXISTS end_date date
+    """)
+
+    # Üzv statistikaları - yalnız aktiv üzvlər
+    cr.execute("""
+        UPDATE course_group g
+           SET member_count = COALESCE(m.active_count, 0),
+               active_member_count = COALESCE(m.active_count, 0),
+               total_monthly_payment = COALESCE(m.total_amount, 0)
+          FROM course_group g2
+     LEFT JOIN (
+                SELECT group_id,
+                       COUNT(*) AS active_count,
+                       SUM(COALESCE(total_amount, 0)) AS total_amount
+                  FROM course_group_member
+                 WHERE status = 'active'
+              GROUP BY group_id
+               ) m ON m.group_id = g2.id
+         WHERE g.id = g2.id
+    """)
+
+    # Dərs statistikaları və bitmə tarixi
+    cr.execute("""
+        UPDATE course_group g
+           SET lesson_day_count = COALESCE(l.lesson_count, 0),
+               lessons_with_teacher_count = COALESCE(l.with_teacher_count, 0),
+               end_date = COALESCE(
+                   l.last_lesson_date,
+                   CASE WHEN g2.start_date IS NOT NULL AND COALESCE(g2.number_of_weeks, 0) != 0
+                        THEN g2.start_date + g2.number_of_weeks * 7
+                   END
+               )
+          FROM course_group g2
+     LEFT JOIN (
+                SELECT group_id,
+                       COUNT(*) AS lesson_count,
+                       COUNT(teacher_id) AS with_teacher_count,
+                       MAX(lesson_date) AS last_lesson_date
+                  FROM course_group_lesson_day
+              GROUP BY group_id
+               ) l ON l.group_id = g2.id
+         WHERE g.id = g2.id
+    """)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from odoo.tools.sql import create_m2m_table, table_exists
+
+
+def migrate(cr, version):
+    """Aktiv qruplar əlaqə cədvəlini SQL ilə doldur.
+
+    Cədvəl ORM-dən əvvəl yaradılır ki, yeniləmə zamanı bütün qeydiyyatlar
+    üçün hesablanmış sahə Python-da yenidən hesablanmasın.
+    """
+    if not version:
+        return
+
+    if not table_exists(cr, 'edde_registration_active_group_rel'):
+        create_m2m_table(
+            cr, 'edde_registration_active_group_rel',
+            'registration_id', 'group_id',
+            'RELATION BETWEEN edde_course_registration AND course_group',
+        )
+
+    cr.execute("""
+        INSERT INTO edde_registration_active_group_rel (registration_id, group_id)
+        SELECT DISTINCT student_name, group_id
+          FROM course_group_member
+         WHERE status = 'active'
+           AND student_name IS NOT NULL
+           AND group_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """)
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Mövcud qrup üzvləri üçün ödəniş planından taksit qrafiki yarat"""
+    if not version:
+        return
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    members = env['course.group.member'].with_context(active_test=False).search([
+        ('total_amount', '>', 0),
+        ('payment_plan', '!=', 'custom'),
+    ])
+    members.generate_installments()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from odoo import api, SUPERUSER_ID
+from odoo.tools import split_every
+
+
+def migrate(cr, version):
+    """Köhnə yaradılmış həftəlik qrafik sətirlərini qrup qrafikinə bağla.
+
+    Əvvəlki ``update_schedule_from_groups`` sətirləri ``group_schedule_id``
+    olmadan yaradırdı; avtomatik yenilənmə onları əl ilə əlavə edilmiş sayıb
+    saxlayır və yanına yeni sətirlər əlavə edirdi. Sətirlər (tələbə, qrup,
+    gün, saatlar) üzrə qrup qrafikinə bağlanır, uyğun gəlməyən köhnə
+    yaradılmış sətirlər silinir və həmin tələbələrin qrafiki yenidən qurulur.
+    """
+    if not version:
+        return
+
+    cr.execute("""
+        WITH candidates AS (
+            SELECT DISTINCT ON (schedule.id)
+                   schedule.id AS schedule_id, schedule.lesson_id, group_schedule.id AS group_schedule_id
+              FROM course_lesson_schedule schedule
+              JOIN course_group_member member ON member.student_name = schedule.lesson_id
+                                             AND member.status = 'active'
+              JOIN course_group_schedule group_schedule ON group_schedule.group_id = member.group_id
+                                                      AND group_schedule.is_active
+                                                      AND group_schedule.day_of_week = schedule.day_of_week
+                                                      AND group_schedule.start_time = schedule.start_time
+                                                      AND group_schedule.end_time = schedule.end_time
+             WHERE schedule.group_schedule_id IS NULL
+          ORDER BY schedule.id, group_schedule.id
+        ), links AS (
+            -- Hər (tələbə, qrup qrafiki) cütünə yalnız bir sətir bağlanır
+            SELECT DISTINCT ON (lesson_id, group_schedule_id) schedule_id, group_schedule_id
+              FROM candidates
+          ORDER BY lesson_id, group_schedule_id, schedule_id
+        )
+        UPDATE course_lesson_schedule schedule
+           SET group_schedule_id = links.group_schedule_id
+          FROM links
+         WHERE schedule.id = links.schedule_id
+    """)
+
+    # Bağlanmayan köhnə yaradılmış sətirlər (qeyd "Qrup: ..." ilə başlayır) köhnəlib
+    cr.execute("""
+        DELETE FROM course_lesson_schedule
+         WHERE group_schedule_id IS NULL
+           AND notes LIKE 'Qrup: %'
+     RETURNING lesson_id
+    """)
+    registration_ids = sorted({row[0] for row in cr.fetchall()})
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Registration = env['edde.course.registration'].with_context(active_test=False)
+    for ids in split_every(1000, registration_ids):
+        Registration.browse(ids)._rebuild_schedule_from_groups()
+        env.invalidate_all()
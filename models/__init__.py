@@ -2,8 +2,10 @@ from . import course_registration
 from . import course_group
 from . import course_group_member
 from . import group_member_payment
+from . import group_member_installment
 from . import course_lesson_attendance
 from . import res_partner
 from . import teacher_salary
 from . import course_config
-from . import crm_lead
\ No newline at end of file
+from . import crm_lead
+from . import name_recompute_queue
\ No newline at end of file
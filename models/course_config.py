@@ -1,4 +1,5 @@
-from odoo import models, fields
+from odoo import models, fields, api
+from odoo.tools import SQL
 
 class CourseProgram(models.Model):
     _name = 'course.program'
@@ -32,4 +33,56 @@ class CourseCountry(models.Model):
     _name = 'course.country'
     _description = 'Student Country'
     
-    name = fields.Char('Ölkə', required=True)
\ No newline at end of file
+    name = fields.Char('Ölkə', required=True)
+
+
+class CourseRoom(models.Model):
+    _name = 'course.room'
+    _description = 'Course Room'
+    _order = 'name'
+    
+    name = fields.Char('Otaq', required=True)
+    capacity = fields.Integer('Tutum', help='Otaqda eyni vaxtda ola biləcək tələbə sayı')
+    description = fields.Text('Təsvir')
+    active = fields.Boolean(default=True)
+    
+    _sql_constraints = [
+        ('name_unique', 'unique(name)', 'Bu adda otaq artıq mövcuddur!'),
+    ]
+    
+    @api.model
+    def _get_free_rooms(self, datetime_start, datetime_end, min_capacity=0):
+        """Verilən vaxt aralığında boş olan aktiv otaqları qaytarır.
+
+        Şərt dərs günlərindəki exclusion constraint-in predikatı ilə eynidir,
+        ona görə yoxlama həmin GiST indeksi ilə aparılır.
+        """
+        self.env['course.group.lesson.day'].flush_model(
+            ['room_id', 'datetime_start', 'datetime_end', 'status']
+        )
+        self.flush_model(['active', 'capacity', 'name'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT room.id
+              FROM %(room_table)s room
+             WHERE room.active
+               AND COALESCE(room.capacity, 0) >= %(min_capacity)s
+               AND NOT EXISTS (
+                    SELECT 1
+                      FROM %(lesson_table)s lesson
+                     WHERE lesson.room_id = room.id
+                       AND lesson.datetime_start IS NOT NULL
+                       AND lesson.datetime_end IS NOT NULL
+                       AND lesson.status != 'cancelled'
+                       AND tsrange(lesson.datetime_start, lesson.datetime_end)
+                           && tsrange(%(start)s, %(end)s)
+               )
+          ORDER BY room.name
+            """,
+            room_table=SQL.identifier(self._table),
+            lesson_table=SQL.identifier(self.env['course.group.lesson.day']._table),
+            min_capacity=min_capacity,
+            start=datetime_start,
+            end=datetime_end,
+        ))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
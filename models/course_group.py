@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+import heapq
+from collections import defaultdict
 from datetime import timedelta
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
 
 
 class CourseGroup(models.Model):
@@ -17,30 +21,30 @@ class CourseGroup(models.Model):
     schedule_ids = fields.One2many('course.group.schedule', 'group_id', string="Qrup Qrafiki")
     number_of_weeks = fields.Integer(string="Həftə sayı", default=4)
     start_date = fields.Date(string="Başlama Tarixi", default=fields.Date.today, required=True)
-    end_date = fields.Date(compute='_compute_end_date', string="Bitmə Tarixi")
+    end_date = fields.Date(compute='_compute_end_date', string="Bitmə Tarixi", store=True, index=True)
 
     # Qrup üzvləri
     teacher_id = fields.Many2one('res.partner', string="Müəllim", domain=[('is_teacher', '=', True)])
     member_ids = fields.One2many('course.group.member', 'group_id', string="Qrup Üzvləri")
-    member_count = fields.Integer(string="Üzv Sayı", compute='_compute_member_count')
+    member_count = fields.Integer(string="Üzv Sayı", compute='_compute_member_count', store=True, index=True)
     
     # Dərs günləri
     lesson_day_ids = fields.One2many('course.group.lesson.day', 'group_id', string="Dərs Günləri")
     
     # Statistika sahələri
     lesson_day_count = fields.Integer(
-        string='Ümumi Dərs Sayı', compute='_compute_lesson_stats'
+        string='Ümumi Dərs Sayı', compute='_compute_lesson_stats', store=True, index=True
     )
     lessons_with_teacher_count = fields.Integer(
-        string='Müəllimi olan Dərslər', compute='_compute_lesson_stats'
+        string='Müəllimi olan Dərslər', compute='_compute_lesson_stats', store=True, index=True
     )
     
     # Üzv statistikaları
     total_monthly_payment = fields.Float(
-        string='Ümumi Ödəniş', compute='_compute_member_stats'
+        string='Ümumi Ödəniş', compute='_compute_member_stats', store=True, index=True
     )
     active_member_count = fields.Integer(
-        string='Aktiv Üzv Sayı', compute='_compute_member_stats'
+        string='Aktiv Üzv Sayı', compute='_compute_member_stats', store=True, index=True
     )
     
     # Aktivlik
@@ -62,7 +66,7 @@ class CourseGroup(models.Model):
             else:
                 group.end_date = False
 
-    @api.depends('member_ids')
+    @api.depends('member_ids', 'member_ids.status')
     def _compute_member_count(self):
         for group in self:
             group.member_count = len(group.member_ids.filtered(lambda m: m.status == 'active'))
@@ -81,71 +85,65 @@ class CourseGroup(models.Model):
             group.total_monthly_payment = sum(active_members.mapped('total_amount'))
     
     def generate_lesson_days(self):
-        """Həftəlik qrafikə və həftə sayına əsasən dərs günlərini yaradır"""
-        self.ensure_one()
-        
+        """Həftəlik qrafikə və həftə sayına əsasən qrupların dərs günlərini yaradır.
+
+        Bütün qruplar üçün dərs günləri bir ``create`` çağırışı ilə yaradılır,
+        devamiyyət qeydləri də həmin create daxilində toplu əlavə olunur.
+        """
         # Köhnə sistemi qoru amma sadələşdir
         # Yalnız "scheduled" statusu olan köhnə dərsləri sil
         old_scheduled_lessons = self.lesson_day_ids.filtered(lambda l: l.status == 'scheduled')
         old_scheduled_lessons.unlink()
         
+        lesson_vals = []
+        for group in self:
+            for lesson_date, schedule in group._iter_planned_lessons():
+                lesson_vals.append(group._prepare_lesson_day_vals(lesson_date, schedule))
+        
+        if not lesson_vals:
+            return self.env['course.group.lesson.day']
+        
+        # Yeni dərs günləri yarat - devamiyyət qeydləri create zamanı toplu yaradılır
+        return self.env['course.group.lesson.day'].create(lesson_vals)
+    
+    def _get_weekday_schedule_map(self):
+        """Həftənin günü (0-6) → aktiv qrafik sətirləri xəritəsini qaytarır"""
+        self.ensure_one()
+        schedule_map = defaultdict(list)
+        for schedule in self.schedule_ids:
+            if schedule.is_active:
+                schedule_map[int(schedule.day_of_week)].append(schedule)
+        return schedule_map
+    
+    def _iter_planned_lessons(self):
+        """Qrafikə görə planlaşdırılan (tarix, qrafik sətri) cütlərini qaytarır"""
+        self.ensure_one()
         if not self.start_date or not self.number_of_weeks or not self.schedule_ids:
             return
         
-        lesson_vals = []
+        schedule_map = self._get_weekday_schedule_map()
+        if not schedule_map:
+            return
+        
         current_date = self.start_date
         planned_end_date = self.start_date + timedelta(weeks=self.number_of_weeks)
-        
         while current_date <= planned_end_date:
-            day_of_week = str(current_date.weekday())
-            
-            # Bu günə aid qrafik var mı?
-            day_schedules = self.schedule_ids.filtered(
-                lambda s: s.day_of_week == day_of_week and s.is_active
-            )
-            
-            for schedule in day_schedules:
-                lesson_vals.append({
-                    'group_id': self.id,
-                    'lesson_date': current_date,
-                    'start_time': schedule.start_time,
-                    'end_time': schedule.end_time,
-                    'teacher_id': self.teacher_id.id if self.teacher_id else False,
-                    'status': 'scheduled'
-                })
-            
+            for schedule in schedule_map.get(current_date.weekday(), ()):
+                yield current_date, schedule
             current_date += timedelta(days=1)
-        
-        # Yeni dərs günləri yarat
-        if lesson_vals:
-            new_lessons = self.env['course.group.lesson.day'].create(lesson_vals)
-            
-            # Yeni yaradılan dərs günləri üçün avtomatik devamiyyət yarat
-            self._create_attendance_for_new_lessons(new_lessons)
     
-    def _create_attendance_for_new_lessons(self, lesson_days):
-        """Yeni yaradılmış dərs günləri üçün aktiv üzvlərə devamiyyət yarat"""
+    def _prepare_lesson_day_vals(self, lesson_date, schedule):
+        """Bir dərs günü üçün create dəyərlərini hazırlayır"""
         self.ensure_one()
-        
-        active_members = self.member_ids.filtered(lambda m: m.status == 'active')
-        attendance_vals = []
-        
-        for lesson_day in lesson_days:
-            for member in active_members:
-                # Yalnız üzvün başlama tarixindən sonrakı dərslər
-                if lesson_day.lesson_date >= member.join_date:
-                    # End date varsa və ötübse devamiyyət yaratma
-                    if member.end_date and lesson_day.lesson_date > member.end_date:
-                        continue
-                        
-                    attendance_vals.append({
-                        'lesson_day_id': lesson_day.id,
-                        'student_id': member.id,
-                        'is_present': True
-                    })
-        
-        if attendance_vals:
-            self.env['course.lesson.attendance'].create(attendance_vals)
+        return {
+            'group_id': self.id,
+            'lesson_date': lesson_date,
+            'start_time': schedule.start_time,
+            'end_time': schedule.end_time,
+            'teacher_id': self.teacher_id.id if self.teacher_id else False,
+            'room_id': schedule.room_id.id,
+            'status': 'scheduled'
+        }
     
     @api.onchange('start_date', 'number_of_weeks', 'schedule_ids')
     def _onchange_schedule_data(self):
@@ -158,85 +156,179 @@ class CourseGroup(models.Model):
         """Qrafik dəyişəndə avtomatik dərs günlərini yenilə"""
         res = super().write(vals)
         
+        if 'name' in vals:
+            # Ad nüsxələri (dərs günü, üzvlük, ödəniş) cron ilə yenilənir
+            self.env['edde.name.recompute.queue']._enqueue(self)
+        
         # Əgər kritik sahələr dəyişibsə, dərs günlərini yenilə
         schedule_changed = any(key in vals for key in ['start_date', 'number_of_weeks'])
         
         if schedule_changed:
-            for group in self:
-                if group.start_date and group.number_of_weeks and group.schedule_ids:
-                    group._smart_update_lesson_days()
+            self.filtered(
+                lambda g: g.start_date and g.number_of_weeks and g.schedule_ids
+            )._reschedule_lesson_days()
         
         return res
     
-    def _smart_update_lesson_days(self):
-        """Ağıllı dərs günü yenilənməsi - mövcud saatları yenilə, yeni günlər əlavə et"""
-        self.ensure_one()
+    def _reschedule_lesson_days(self):
+        """Dərs günlərini plana uyğunlaşdırır - yalnız fərq tətbiq olunur.
+
+        Planlaşdırılan dərslər mövcud dərslərlə bir keçiddə müqayisə edilir:
+        çatmayanlar yaradılır, saatı və ya müəllimi dəyişənlər yenilənir,
+        plandan kənarda qalan scheduled dərslər isə devamiyyəti ilə birlikdə
+        silinir. Keçirilmiş və ləğv edilmiş dərslərə toxunulmur.
+        """
+        if not self:
+            return
         
-        # 1. Mövcud scheduled dərslərin saatlarını yenilə
-        self._update_existing_lesson_times()
+        LessonDay = self.env['course.group.lesson.day']
+        lessons_by_date = defaultdict(lambda: LessonDay)
+        for lesson in LessonDay.search([('group_id', 'in', self.ids)]):
+            lessons_by_date[lesson.group_id.id, lesson.lesson_date] |= lesson
         
-        # 2. Çatmayan dərs günlərini əlavə et
-        self._add_missing_lesson_days()
-    
-    def _update_existing_lesson_times(self):
-        """Mövcud scheduled dərslərin saatlarını qrafikə uyğun yenilə"""
-        scheduled_lessons = self.lesson_day_ids.filtered(lambda l: l.status == 'scheduled')
+        planned_by_date = defaultdict(list)
+        for group in self:
+            for lesson_date, schedule in group._iter_planned_lessons():
+                planned_by_date[group.id, lesson_date].append(
+                    group._prepare_lesson_day_vals(lesson_date, schedule)
+                )
         
-        for lesson in scheduled_lessons:
-            day_of_week = str(lesson.lesson_date.weekday())
-            matching_schedule = self.schedule_ids.filtered(
-                lambda s: s.day_of_week == day_of_week and s.is_active
+        create_vals, updates, lessons_to_remove = [], [], LessonDay
+        for key in planned_by_date.keys() | lessons_by_date.keys():
+            to_create, to_update, to_remove = self._diff_lesson_slots(
+                planned_by_date.get(key, []), lessons_by_date.get(key, LessonDay)
             )
-            
-            if matching_schedule:
-                # İlk uyğun qrafik götür
-                schedule = matching_schedule[0]
-                lesson.write({
-                    'start_time': schedule.start_time,
-                    'end_time': schedule.end_time,
-                    'teacher_id': self.teacher_id.id if self.teacher_id else False
-                })
+            create_vals += to_create
+            updates += to_update
+            lessons_to_remove |= to_remove
+        
+        # Devamiyyət qeydləri ondelete='cascade' ilə silinir
+        lessons_to_remove.unlink()
+        self._apply_lesson_updates(updates)
+        if create_vals:
+            # Yeni dərslərin devamiyyəti create zamanı toplu yaradılır
+            LessonDay.create(create_vals)
     
-    def _add_missing_lesson_days(self):
-        """Çatmayan dərs günlərini əlavə et"""
-        if not self.start_date or not self.number_of_weeks or not self.schedule_ids:
-            return
+    @api.model
+    def _diff_lesson_slots(self, planned_vals, lessons):
+        """Bir qrupun bir tarixi üçün planı mövcud dərslərlə müqayisə edir.
+
+        ``(yaradılacaq dəyərlər, [(dərs, dəyərlər)], silinəcək dərslər)`` qaytarır.
+        """
+        remaining_vals = sorted(planned_vals, key=lambda vals: vals['start_time'])
         
-        # Mövcud dərs tarixlərini al
-        existing_dates = set(self.lesson_day_ids.mapped('lesson_date'))
+        # Keçirilmiş və ləğv edilmiş dərslər dəyişmir, amma plandakı yerini tutur
+        for lesson in lessons.filtered(lambda l: l.status != 'scheduled'):
+            if not remaining_vals:
+                break
+            matched_vals = next(
+                (vals for vals in remaining_vals if vals['start_time'] == lesson.start_time),
+                remaining_vals[0],
+            )
+            remaining_vals.remove(matched_vals)
         
-        # Planlaşdırılan tarixləri hesabla
-        planned_dates = set()
-        current_date = self.start_date
-        planned_end_date = self.start_date + timedelta(weeks=self.number_of_weeks)
+        LessonDay = self.env['course.group.lesson.day']
+        scheduled_lessons = lessons.filtered(lambda l: l.status == 'scheduled').sorted('start_time')
         
-        while current_date <= planned_end_date:
-            day_of_week = str(current_date.weekday())
-            if self.schedule_ids.filtered(lambda s: s.day_of_week == day_of_week and s.is_active):
-                planned_dates.add(current_date)
-            current_date += timedelta(days=1)
+        # Qrafik sətrinə artıq uyğun olan dərslər yerində qalır ki, bir sətrin
+        # dəyişməsi eyni gündəki digər sətrin dərsinə toxunmasın
+        unmatched_lessons = LessonDay
+        for lesson in scheduled_lessons:
+            slot_key = lesson._get_slot_key()
+            matched_vals = next(
+                (vals for vals in remaining_vals if LessonDay._get_slot_key_from_vals(vals) == slot_key),
+                None,
+            )
+            if matched_vals is None:
+                unmatched_lessons |= lesson
+            else:
+                remaining_vals.remove(matched_vals)
         
-        # Çatmayan tarixlər üçün dərs günləri yarat
-        missing_dates = planned_dates - existing_dates
+        # Qalan dərslər qalan sətirlərə başlama vaxtı sırası ilə paylanır
+        return (
+            remaining_vals[len(unmatched_lessons):],
+            list(zip(unmatched_lessons, remaining_vals)),
+            unmatched_lessons[len(remaining_vals):],
+        )
+    
+    @api.model
+    def _apply_lesson_updates(self, updates):
+        """(dərs, dəyərlər) cütlərini yeni (başlama, bitmə, müəllim, otaq)
+        dəyərlərinə görə qruplaşdırıb hər qrup üçün bir ``write`` edir"""
+        LessonDay = self.env['course.group.lesson.day']
+        lessons_by_values = defaultdict(lambda: LessonDay)
+        for lesson, vals in updates:
+            lessons_by_values[LessonDay._get_slot_key_from_vals(vals)] |= lesson
         
-        lesson_vals = []
-        for date in missing_dates:
-            day_of_week = str(date.weekday())
-            schedules = self.schedule_ids.filtered(lambda s: s.day_of_week == day_of_week and s.is_active)
-            
-            for schedule in schedules:
-                lesson_vals.append({
-                    'group_id': self.id,
-                    'lesson_date': date,
-                    'start_time': schedule.start_time,
-                    'end_time': schedule.end_time,
-                    'teacher_id': self.teacher_id.id if self.teacher_id else False,
-                    'status': 'scheduled'
-                })
+        # Otaqların yerdəyişməsi aralıq vəziyyətdə kəsişmə yarada bilər -
+        # məhdudiyyət bütün yazılardan sonra bir dəfə yoxlanılır
+        for slot_key, lessons in lessons_by_values.items():
+            lessons.with_context(defer_room_check=True).write(dict(zip(LessonDay._SLOT_FIELDS, slot_key)))
+        if lessons_by_values:
+            LessonDay._check_room_overlaps()
+    
+    def _update_existing_lesson_times(self):
+        """Qrafik sətri dəyişəndə dərs günləri yaradılmış qrupların dərslərini
+        plana uyğunlaşdırır.
+
+        Bir həftə günündə bir neçə qrafik sətri ola bilər, ona görə hər dərs
+        (qrup, tarix) üzrə öz sətri ilə tutuşdurulur - ``_reschedule_lesson_days``
+        ilə eyni fərq tətbiq olunur. Deaktiv edilən sətrin scheduled dərsləri
+        silinir, yeni aktiv sətrin dərsləri isə yaradılır.
+        """
+        self.filtered(
+            lambda g: g.lesson_day_ids and g.start_date and g.number_of_weeks
+        )._reschedule_lesson_days()
+    
+    def _rebuild_member_schedules(self):
+        """Qrupların aktiv üzvlərinin həftəlik qrafikini toplu yenilə"""
+        if not self:
+            return
+        members = self.env['course.group.member'].search([
+            ('group_id', 'in', self.ids),
+            ('status', '=', 'active'),
+        ])
+        members.student_name._rebuild_schedule_from_groups()
+    
+    def enroll_registrations(self, registrations, join_date=None, member_vals=None):
+        """Bir neçə tələbə qeydiyyatını qrupa toplu üzv kimi əlavə edir.
+
+        Təkrar aktiv üzvlük bir sorğu ilə yoxlanılır, üzvlüklər bir ``create``
+        ilə yaradılır və mövcud dərslər üçün devamiyyət toplu əlavə olunur.
+        """
+        self.ensure_one()
+        if not registrations:
+            return self.env['course.group.member']
         
-        if lesson_vals:
-            new_lessons = self.env['course.group.lesson.day'].create(lesson_vals)
-            self._create_attendance_for_new_lessons(new_lessons)
+        # Artıq aktiv üzv olan tələbələri bir sorğu ilə tap
+        existing = self.env['course.group.member'].search([
+            ('group_id', '=', self.id),
+            ('student_name', 'in', registrations.ids),
+            ('status', '=', 'active'),
+        ])
+        if existing:
+            codes = ', '.join(existing.student_name.mapped('student_code'))
+            raise ValidationError(f"Bu tələbələr artıq {self.name} qrupunda aktiv üzvdür: {codes}")
+        
+        base_vals = dict(member_vals or {}, group_id=self.id, status='active')
+        if join_date:
+            base_vals['join_date'] = join_date
+        
+        return self.env['course.group.member'].create([
+            dict(base_vals, student_name=registration.id) for registration in registrations
+        ])
+    
+    def action_open_enroll_wizard(self):
+        """Tələbələri toplu əlavə etmək üçün wizard açar"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Tələbələri Əlavə Et',
+            'res_model': 'course.group.enroll.wizard',
+            'view_mode': 'form',
+            'context': {'default_group_id': self.id},
+            'target': 'new'
+        }
     
     def action_generate_lesson_days(self):
         """Dərs günlərini yaratmaq üçün button action"""
@@ -269,6 +361,10 @@ class CourseGroup(models.Model):
         lesson_days = self.lesson_day_ids.filtered(lambda l: not l.teacher_id)
         lesson_days.write({'teacher_id': self.teacher_id.id})
         
+        # İstəyə görə müəllimin başqa qruplardakı dərsləri ilə konflikt yoxlanışı
+        if self.env.context.get('check_teacher_conflicts'):
+            lesson_days._check_teacher_conflicts()
+        
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -301,6 +397,9 @@ class CourseGroupSchedule(models.Model):
     start_time = fields.Float(string="Başlama Vaxtı", required=True, help="Məsələn 19.5 = 19:30")
     end_time = fields.Float(string="Bitmə Vaxtı", required=True, help="Məsələn 20.5 = 20:30")
     
+    # Otaq
+    room_id = fields.Many2one('course.room', string="Otaq")
+    
     # Aktivlik
     is_active = fields.Boolean(string="Aktiv", default=True)
     
@@ -317,17 +416,33 @@ class CourseGroupSchedule(models.Model):
             if schedule.end_time < 0 or schedule.end_time > 24:
                 raise ValidationError("Bitmə vaxtı 0-24 aralığında olmalıdır!")
     
+    # Tələbələrin həftəlik qrafikinə köçürülən sahələr
+    _TIMETABLE_FIELDS = ('group_id', 'day_of_week', 'start_time', 'end_time', 'is_active')
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Yeni qrafik sətri qrup üzvlərinin həftəlik qrafikinə əlavə olunur"""
+        schedules = super().create(vals_list)
+        schedules.group_id._rebuild_member_schedules()
+        return schedules
+    
     def write(self, vals):
-        """Qrafik dəyişəndə uyğun dərs günlərini yenilə"""
+        """Qrafik dəyişəndə uyğun dərs günlərini və üzvlərin qrafikini yenilə"""
+        timetable_changed = any(key in vals for key in self._TIMETABLE_FIELDS)
+        # Qrafik başqa qrupa keçirilərsə köhnə qrupun üzvləri də yenilənməlidir
+        affected_groups = self.group_id
+        
         res = super().write(vals)
         
         # Əgər vaxt dəyişibsə, qrupun dərs günlərini yenilə
-        time_changed = any(key in vals for key in ['start_time', 'end_time', 'is_active'])
+        time_changed = any(key in vals for key in ['start_time', 'end_time', 'room_id', 'is_active'])
         
         if time_changed:
-            for schedule in self:
-                if schedule.group_id:
-                    schedule.group_id._update_existing_lesson_times()
+            # Hər qrup bir dəfə yenilənir, neçə qrafik sətri dəyişməsindən asılı olmayaraq
+            self.group_id._update_existing_lesson_times()
+        
+        if timetable_changed:
+            (affected_groups | self.group_id)._rebuild_member_schedules()
         
         return res
 
@@ -361,6 +476,9 @@ class CourseGroupLessonDay(models.Model):
     # Müəllim
     teacher_id = fields.Many2one('res.partner', string="Müəllim", domain=[('is_teacher', '=', True)])
     
+    # Otaq
+    room_id = fields.Many2one('course.room', string="Otaq")
+    
     # Status
     status = fields.Selection([
         ('scheduled', 'Planlaşdırılıb'),
@@ -373,6 +491,41 @@ class CourseGroupLessonDay(models.Model):
     # Devamiyyət əlaqəsi
     attendance_list = fields.One2many('course.lesson.attendance', 'lesson_day_id', string="İştirak Siyahısı")
     
+    # Müəllim maaşının dərs sayına təsir edən sahələr
+    _SALARY_TRACKED_FIELDS = ('status', 'teacher_id', 'lesson_date')
+    
+    # Qrafikdən götürülən və dəyişəndə planla sinxronlaşdırılan sahələr
+    _SLOT_FIELDS = ('start_time', 'end_time', 'teacher_id', 'room_id')
+    
+    # Eyni otaqda vaxtı kəsişən dərslərin qarşısını verilənlər bazası alır;
+    # GiST indeksi boş otaq axtarışında da istifadə olunur (btree_gist tələb edir).
+    # Məhdudiyyət ertələnir ki, toplu yeniləmədə iki dərsin otaqlarını dəyişmək
+    # mümkün olsun; yoxlama _check_room_overlaps ilə write/create sonunda aparılır
+    _sql_constraints = [
+        ('room_time_no_overlap',
+         """EXCLUDE USING gist (room_id WITH =, tsrange(datetime_start, datetime_end) WITH &&)
+            WHERE (room_id IS NOT NULL AND datetime_start IS NOT NULL
+                   AND datetime_end IS NOT NULL AND status != 'cancelled')
+            DEFERRABLE INITIALLY DEFERRED""",
+         'Bu otaq həmin vaxtda artıq başqa dərs üçün tutulub!'),
+    ]
+    
+    # Dəyişəndə otaq kəsişməsi yoxlanılan sahələr
+    _ROOM_CHECK_FIELDS = ('room_id', 'lesson_date', 'start_time', 'end_time', 'status')
+    
+    def _auto_init(self):
+        # Tam ədəd sütunu (room_id) GiST indeksində bərabərlik üçün btree_gist lazımdır
+        self.env.cr.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        return super()._auto_init()
+    
+    def init(self):
+        # Maaş hesablaması: müəllim + tarix aralığı + status
+        create_index(self.env.cr, 'course_group_lesson_day_teacher_date_status_idx',
+                     self._table, ['teacher_id', 'lesson_date', 'status'])
+        # Qrupun dərs günləri tarixə görə
+        create_index(self.env.cr, 'course_group_lesson_day_group_date_idx',
+                     self._table, ['group_id', 'lesson_date'])
+    
     @api.depends('lesson_date')
     def _compute_day_of_week(self):
         for lesson in self:
@@ -436,45 +589,226 @@ class CourseGroupLessonDay(models.Model):
         if self.group_id and self.group_id.teacher_id:
             self.teacher_id = self.group_id.teacher_id
     
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Dərs günləri yaradılanda avtomatik olaraq devamiyyət qeydlərini yarat"""
+        lesson_days = super().create(vals_list)
+        lesson_days._create_attendance_records()
+        self.env['teacher.salary']._mark_lesson_counts_dirty(lesson_days._get_salary_periods())
+        if any(vals.get('room_id') for vals in vals_list):
+            self._check_room_overlaps()
+        return lesson_days
+    
+    def write(self, vals):
+        """Keçirilmiş dərs, müəllim və ya tarix dəyişdikdə təsirlənən maaşları işarələ"""
+        track_salary = any(fname in vals for fname in self._SALARY_TRACKED_FIELDS)
+        periods = self._get_salary_periods() if track_salary else set()
+        
+        res = super().write(vals)
+        
+        if track_salary:
+            periods |= self._get_salary_periods()
+            self.env['teacher.salary']._mark_lesson_counts_dirty(periods)
+        if any(fname in vals for fname in self._ROOM_CHECK_FIELDS):
+            self._check_room_overlaps()
+        return res
+    
     @api.model
-    def create(self, vals):
-        """Dərs günü yaradılanda avtomatik olaraq devamiyyət qeydlərini yarat"""
-        lesson_day = super().create(vals)
-        lesson_day._create_attendance_records()
-        return lesson_day
+    def _check_room_overlaps(self):
+        """Ertələnmiş otaq məhdudiyyətini dərhal yoxlayır.
+
+        Xəta commit-ə qədər gözləmir, istifadəçiyə adi məhdudiyyət mesajı
+        kimi qaytarılır. ``defer_room_check`` kontekstində yoxlama çağıranın
+        öhdəsinə buraxılır (bax ``course.group._apply_lesson_updates``).
+        """
+        if self.env.context.get('defer_room_check'):
+            return
+        self.flush_model(['room_id', 'datetime_start', 'datetime_end', 'status'])
+        constraint = SQL.identifier(f'{self._table}_room_time_no_overlap')
+        self.env.cr.execute(SQL('SET CONSTRAINTS %s IMMEDIATE', constraint))
+        self.env.cr.execute(SQL('SET CONSTRAINTS %s DEFERRED', constraint))
+    
+    def unlink(self):
+        """Keçirilmiş dərs silindikdə təsirlənən maaşları işarələ"""
+        periods = self._get_salary_periods()
+        res = super().unlink()
+        self.env['teacher.salary']._mark_lesson_counts_dirty(periods)
+        return res
     
-    def _create_attendance_records(self):
-        """Bu dərs günü üçün qrup üzvlərinin devamiyyət qeydlərini yarat"""
+    def _get_slot_key(self):
+        """Dərsin qrafikdən gələn (başlama, bitmə, müəllim, otaq) dəyərləri"""
         self.ensure_one()
-        if not self.group_id:
+        return (self.start_time, self.end_time, self.teacher_id.id, self.room_id.id)
+    
+    @api.model
+    def _get_slot_key_from_vals(self, vals):
+        """``_prepare_lesson_day_vals`` dəyərlərindən eyni açarı qurur"""
+        return tuple(vals[fname] for fname in self._SLOT_FIELDS)
+    
+    def _get_salary_periods(self):
+        """Keçirilmiş dərslərin təsir etdiyi (müəllim, ay) cütlərini qaytarır"""
+        return {
+            (lesson.teacher_id.id, lesson.lesson_date.replace(day=1))
+            for lesson in self
+            if lesson.status == 'completed' and lesson.teacher_id and lesson.lesson_date
+        }
+    
+    def _create_attendance_records(self):
+        """Dərs günləri üçün qrup üzvlərinin çatmayan devamiyyət qeydlərini toplu yarat"""
+        lesson_days = self.filtered('group_id')
+        if not lesson_days:
             return
-            
-        # Aktiv qrup üzvlərini tap
-        active_members = self.group_id.member_ids.filtered(lambda m: m.status == 'active')
         
-        # Hər üzv üçün devamiyyət qeydi yarat (yalnız qrupə başlama tarixindən sonra)
+        # Aktiv qrup üzvlərini qruplara görə topla
+        active_members_by_group = defaultdict(list)
+        for member in lesson_days.group_id.member_ids:
+            if member.status == 'active':
+                active_members_by_group[member.group_id.id].append(member)
+        if not active_members_by_group:
+            return
+        
+        # Hər üzv üçün devamiyyət qeydi yarat (yalnız üzvlük müddətinə düşən dərslər).
+        # Mövcud (dərs günü, üzv) cütləri SQL səviyyəsində ötürülür.
         attendance_vals = []
-        for member in active_members:
-            # Yalnız üzvün qrupa başlama tarixi dərs tarixindən əvvəl və ya bərabərdirsə əlavə et
-            if member.join_date <= self.lesson_date:
-                # Əvvəlcə bu üzvün bu dərs günü üçün qeydi var mı yoxla
-                existing = self.env['course.lesson.attendance'].search([
-                    ('lesson_day_id', '=', self.id),
-                    ('student_id', '=', member.id)
-                ])
-                if not existing:
-                    attendance_vals.append({
-                        'lesson_day_id': self.id,
-                        'student_id': member.id,
-                        # 'is_present': True  # Default olaraq iştirak var
-                    })
-        
-        if attendance_vals:
-            self.env['course.lesson.attendance'].create(attendance_vals)
+        for lesson_day in lesson_days:
+            for member in active_members_by_group.get(lesson_day.group_id.id, ()):
+                if not member._is_enrolled_on(lesson_day.lesson_date):
+                    continue
+                attendance_vals.append({
+                    'lesson_day_id': lesson_day.id,
+                    'student_id': member.id,
+                    # 'is_present': True  # Default olaraq iştirak var
+                })
+        
+        self.env['course.lesson.attendance']._create_missing(attendance_vals)
+    
+    @api.model
+    def _find_teacher_conflicts(self, date_from, date_to, teacher_ids=None):
+        """Tarix aralığında müəllimlərin üst-üstə düşən dərslərini tapır.
+
+        Dərslər bir sorğu ilə müəllim və başlama vaxtına görə sıralanmış
+        oxunur, hər müəllim üçün sweep-line ilə yoxlanılır: hələ bitməmiş
+        dərslər bitmə vaxtına görə heap-də saxlanılır və yeni dərs onların
+        hər biri ilə konflikt sayılır. Ləğv edilmiş dərslər nəzərə alınmır.
+
+        ``(müəllim id, dərs id, digər dərs id, kəsişmə başlanğıcı, kəsişmə sonu)``
+        siyahısı qaytarır.
+        """
+        self.flush_model(['teacher_id', 'lesson_date', 'status', 'datetime_start', 'datetime_end'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT id, teacher_id, datetime_start, datetime_end
+              FROM %s
+             WHERE teacher_id IS NOT NULL
+               AND lesson_date BETWEEN %s AND %s
+               AND status != 'cancelled'
+               AND datetime_start IS NOT NULL
+               AND datetime_end IS NOT NULL
+               %s
+          ORDER BY teacher_id, datetime_start, id
+            """,
+            SQL.identifier(self._table), date_from, date_to,
+            SQL('AND teacher_id IN %s', tuple(teacher_ids)) if teacher_ids else SQL(),
+        ))
+        
+        conflicts = []
+        current_teacher_id, running = None, []
+        for lesson_id, teacher_id, start, end in self.env.cr.fetchall():
+            if teacher_id != current_teacher_id:
+                current_teacher_id, running = teacher_id, []
+            # Bu dərs başlamazdan əvvəl bitmiş dərsləri çıxar
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for running_end, running_id in running:
+                conflicts.append((teacher_id, running_id, lesson_id, start, min(end, running_end)))
+            heapq.heappush(running, (end, lesson_id))
+        return conflicts
+    
+    def _check_teacher_conflicts(self):
+        """Bu dərslərin müəllimi başqa dərslə üst-üstə düşürsə xəta verir"""
+        lessons = self.filtered(lambda l: l.teacher_id and l.lesson_date and l.status != 'cancelled')
+        if not lessons:
+            return
+        
+        lesson_dates = lessons.mapped('lesson_date')
+        lesson_ids = set(lessons.ids)
+        conflicts = [
+            conflict
+            for conflict in self._find_teacher_conflicts(
+                min(lesson_dates), max(lesson_dates), lessons.teacher_id.ids
+            )
+            if conflict[1] in lesson_ids or conflict[2] in lesson_ids
+        ]
+        if not conflicts:
+            return
+        
+        messages = []
+        for teacher_id, lesson_id, other_id, overlap_start, overlap_end in conflicts[:10]:
+            lesson, other = self.browse(lesson_id), self.browse(other_id)
+            messages.append(
+                f"{lesson.teacher_id.name}: {lesson.group_id.name} / {other.group_id.name} "
+                f"({overlap_start:%d.%m.%Y %H:%M}-{overlap_end:%H:%M})"
+            )
+        if len(conflicts) > 10:
+            messages.append(f"... və daha {len(conflicts) - 10} konflikt")
+        raise ValidationError("Müəllimin dərsləri üst-üstə düşür:\n" + "\n".join(messages))
+    
+    def set_roll_call(self, present_member_ids):
+        """Dərsin yoxlamasını bir dəfəyə tətbiq edir.
+
+        ``present_member_ids`` - iştirak edən qrup üzvlərinin id-ləri, qalanlar
+        qeyb sayılır. Yalnız statusu dəyişən qeydlər yazılır: ən çoxu iki
+        ``write`` (iştirak edənlər və qeyblər). Yenilənmiş siyahını qaytarır.
+        """
+        self.ensure_one()
+        present_ids = set(present_member_ids)
+        attendances = self.attendance_list
+        
+        unknown_ids = present_ids - set(attendances.student_id.ids)
+        if unknown_ids:
+            raise ValidationError(
+                f"Bu üzvlərin {self.display_name} dərsində devamiyyət qeydi yoxdur: "
+                f"{', '.join(map(str, sorted(unknown_ids)))}"
+            )
+        
+        to_present = attendances.filtered(lambda a: a.student_id.id in present_ids and not a.is_present)
+        to_absent = attendances.filtered(lambda a: a.student_id.id not in present_ids and a.is_present)
+        to_present.write({'is_present': True})
+        to_absent.write({'is_present': False})
+        return self._get_attendance_sheet()
+    
+    def _get_attendance_sheet(self):
+        """Dərsin devamiyyət siyahısını bir sorğu ilə qaytarır:
+        ``[{'member_id', 'name', 'is_present'}, ...]``"""
+        self.ensure_one()
+        self.check_access('read')
+        Attendance = self.env['course.lesson.attendance']
+        Member = self.env['course.group.member']
+        Registration = self.env['edde.course.registration']
+        Attendance.flush_model(['lesson_day_id', 'student_id', 'is_present'])
+        Member.flush_model(['student_name'])
+        Registration.flush_model(['display_name'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT attendance.student_id, registration.display_name, attendance.is_present
+              FROM %s attendance
+              JOIN %s member ON member.id = attendance.student_id
+              JOIN %s registration ON registration.id = member.student_name
+             WHERE attendance.lesson_day_id = %s
+          ORDER BY registration.display_name, attendance.student_id
+            """,
+            SQL.identifier(Attendance._table),
+            SQL.identifier(Member._table),
+            SQL.identifier(Registration._table),
+            self.id,
+        ))
+        return [
+            {'member_id': member_id, 'name': name, 'is_present': is_present}
+            for member_id, name, is_present in self.env.cr.fetchall()
+        ]
     
     def action_refresh_attendance(self):
         """Yeni üzvlər əlavə olunduqda devamiyyət qeydlərini yenilə"""
-        self.ensure_one()
         self._create_attendance_records()
         return {
             'type': 'ir.actions.client',
@@ -1,5 +1,14 @@
+from collections import defaultdict
+
+from dateutil.relativedelta import relativedelta
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import float_round
+from odoo.tools.sql import create_index
+
+# Dəyişəndə taksit qrafikinin yenidən qurulmasını tələb edən sahələr
+_INSTALLMENT_FIELDS = ('payment_plan', 'total_amount', 'installment_count', 'initial_payment', 'join_date')
 
 
 class CourseGroupMember(models.Model):
@@ -27,6 +36,10 @@ class CourseGroupMember(models.Model):
     ], string='Ödəniş Planı', default='full')
     
     total_amount = fields.Float(string='Ümumi Məbləğ', help='Bu üzv üçün ümumi ödəniş məbləği')
+    initial_payment = fields.Float(string='İlkin Ödəniş', help='Başlama tarixində ödənilən məbləğ')
+    installment_count = fields.Integer(string='Taksit Sayı', default=1,
+                                       help='Qalıq məbləğin bölündüyü aylıq taksitlərin sayı')
+    installment_ids = fields.One2many('group.member.installment', 'member_id', string='Taksitlər')
     paid_amount = fields.Float(string='Ödənilmiş Məbləğ', compute='_compute_payment_status', store=True)
     remaining_amount = fields.Float(string='Qalan Məbləğ', compute='_compute_payment_status', store=True)
     
@@ -55,6 +68,14 @@ class CourseGroupMember(models.Model):
     # Qeydlər
     notes = fields.Text(string='Qeydlər')
     
+    def init(self):
+        # Qrupun üzvləri statusa görə
+        create_index(self.env.cr, 'course_group_member_group_status_idx',
+                     self._table, ['group_id', 'status'])
+        # Aktiv üzvlüyün unikallığı yoxlanışı
+        create_index(self.env.cr, 'course_group_member_student_group_active_idx',
+                     self._table, ['student_name', 'group_id'], where="status = 'active'")
+    
     @api.depends('student_name', 'group_id')
     def _compute_display_name(self):
         for member in self:
@@ -66,95 +87,191 @@ class CourseGroupMember(models.Model):
     @api.constrains('student_name', 'group_id', 'status')
     def _check_unique_active_membership(self):
         """Bir tələbə eyni qrupda yalnız bir aktiv üzvlüyə malik ola bilər"""
-        for member in self:
-            if member.status == 'active':
-                existing = self.search([
-                    ('student_name', '=', member.student_name.id),
-                    ('group_id', '=', member.group_id.id),
-                    ('status', '=', 'active'),
-                    ('id', '!=', member.id)
-                ])
-                if existing:
-                    raise ValidationError(
-                        f"{member.student_name.student_code} artıq {member.group_id.name} qrupunda aktiv üzvdür!"
-                    )
-    
-    @api.model
-    def create(self, vals):
+        active_members = self.filtered(lambda m: m.status == 'active')
+        if not active_members:
+            return
+        
+        # Bütün yoxlanan (tələbə, qrup) cütləri üçün bir qruplaşdırılmış sorğu
+        checked_pairs = {(m.student_name.id, m.group_id.id) for m in active_members}
+        duplicates = self._read_group(
+            [
+                ('student_name', 'in', active_members.student_name.ids),
+                ('group_id', 'in', active_members.group_id.ids),
+                ('status', '=', 'active'),
+            ],
+            ['student_name', 'group_id'],
+            having=[('__count', '>', 1)],
+        )
+        for student, group in duplicates:
+            if (student.id, group.id) in checked_pairs:
+                raise ValidationError(
+                    f"{student.student_code} artıq {group.name} qrupunda aktiv üzvdür!"
+                )
+    
+    @api.model_create_multi
+    def create(self, vals_list):
         """Üzvlük yaradıldıqda tələbənin ödənişini yenilə və devamiyyət qeydləri yarat"""
-        member = super().create(vals)
+        members = super().create(vals_list)
         
         # Ödənişi yenilə
-        if member.monthly_payment and member.student_name:
-            member.student_name.write({'monthly_payment': member.monthly_payment})
+        members._sync_registration_monthly_payment()
+        
+        # Ödəniş planından taksit qrafiki yarat
+        members.generate_installments()
         
         # Mövcud dərs günləri üçün avtomatik devamiyyət qeydləri yarat
-        if member.status == 'active':
-            member._create_attendance_for_existing_lessons()
+        active_members = members.filtered(lambda m: m.status == 'active')
+        active_members._create_attendance_for_existing_lessons()
+        
+        # Tələbələrin həftəlik qrafikinə qrupun qrafikini əlavə et
+        active_members.student_name._rebuild_schedule_from_groups()
         
-        return member
+        return members
     
-    def _create_attendance_for_existing_lessons(self):
-        """Bu üzv üçün mövcud dərs günlərinə devamiyyət qeydləri yarat"""
-        self.ensure_one()
+    def _sync_registration_monthly_payment(self):
+        """Üzvlərin ödənişini tələbə qeydiyyatına yaz - eyni məbləğ üçün bir write"""
+        registrations_by_amount = defaultdict(lambda: self.env['edde.course.registration'])
+        for member in self:
+            if member.monthly_payment and member.student_name:
+                registrations_by_amount[member.monthly_payment] |= member.student_name
         
-        # Yalnız bu üzvün başlama tarixindən sonrakı dərs günləri
-        lesson_days = self.group_id.lesson_day_ids.filtered(
-            lambda l: l.lesson_date >= self.join_date
-        )
+        for amount, registrations in registrations_by_amount.items():
+            registrations.write({'monthly_payment': amount})
+    
+    def _is_enrolled_on(self, lesson_date):
+        """Üzvün verilmiş dərs tarixində qrupda olub-olmadığını yoxlayır"""
+        self.ensure_one()
+        if lesson_date < self.join_date:
+            return False
+        return not self.end_date or lesson_date <= self.end_date
+    
+    def _create_attendance_for_existing_lessons(self):
+        """Üzvlər üçün mövcud dərs günlərinə devamiyyət qeydlərini toplu yarat"""
+        if not self:
+            return
         
-        attendance_vals = []
+        # Bütün qrupların dərs günlərini bir sorğu ilə oxu
+        lesson_days = self.env['course.group.lesson.day'].search([
+            ('group_id', 'in', self.group_id.ids)
+        ])
+        lessons_by_group = defaultdict(list)
         for lesson_day in lesson_days:
-            # Bu dərs günü üçün artıq qeydi var mı?
-            existing = self.env['course.lesson.attendance'].search([
-                ('lesson_day_id', '=', lesson_day.id),
-                ('student_id', '=', self.id)
-            ])
-            
-            if not existing:
-                attendance_vals.append({
-                    'lesson_day_id': lesson_day.id,
-                    'student_id': self.id,
-                    # 'is_present': True  # Default olaraq iştirak var
-                })
+            lessons_by_group[lesson_day.group_id.id].append(lesson_day)
+        
+        # Yalnız üzvün başlama tarixindən sonrakı dərs günləri
+        attendance_vals = [{
+            'lesson_day_id': lesson_day.id,
+            'student_id': member.id,
+            # 'is_present': True  # Default olaraq iştirak var
+        } for member in self
+            for lesson_day in lessons_by_group[member.group_id.id]
+            if member._is_enrolled_on(lesson_day.lesson_date)]
         
-        if attendance_vals:
-            self.env['course.lesson.attendance'].create(attendance_vals)
+        # Artıq mövcud olan qeydlər SQL səviyyəsində ötürülür
+        self.env['course.lesson.attendance']._create_missing(attendance_vals)
     
     def write(self, vals):
         """Üzvlük yenilənəndə tələbənin ödənişini yenilə və devamiyyət idarə et"""
+        timetable_changed = any(fname in vals for fname in ('status', 'group_id', 'student_name'))
+        # Üzvlük başqa tələbəyə keçirilərsə köhnə tələbənin qrafiki də yenilənməlidir
+        registrations = self.student_name if timetable_changed else None
+        
         res = super().write(vals)
         
         # Ödənişi yenilə
         if 'monthly_payment' in vals:
-            for member in self:
-                if member.student_name and member.status == 'active':
-                    member.student_name.write({'monthly_payment': member.monthly_payment})
+            self.filtered(lambda m: m.status == 'active')._sync_registration_monthly_payment()
+        
+        if any(fname in vals for fname in _INSTALLMENT_FIELDS):
+            self.generate_installments()
         
         # Status dəyişdikdə devamiyyət idarə et
         if 'status' in vals:
-            for member in self:
-                if vals['status'] == 'active':
-                    # Aktiv olduqda devamiyyət yarat
-                    member._create_attendance_for_existing_lessons()
-                else:
-                    # Qeyri-aktiv olduqda gələcək dərslər üçün devamiyyət sil
-                    member._remove_future_attendance()
+            if vals['status'] == 'active':
+                # Aktiv olduqda devamiyyət yarat
+                self._create_attendance_for_existing_lessons()
+            else:
+                # Qeyri-aktiv olduqda gələcək dərslər üçün devamiyyət sil
+                self._remove_future_attendance()
+        
+        if timetable_changed:
+            (registrations | self.student_name)._rebuild_schedule_from_groups()
         
         return res
     
-    def _remove_future_attendance(self):
-        """Gələcək dərslər üçün bu üzvün devamiyyət qeydlərini sil"""
+    def unlink(self):
+        """Silinən üzvlüyün qrup qrafikini tələbənin həftəlik qrafikindən çıxar"""
+        registrations = self.filtered(lambda m: m.status == 'active').student_name
+        res = super().unlink()
+        registrations.exists()._rebuild_schedule_from_groups()
+        return res
+    
+    def _prepare_installment_vals(self):
+        """Ödəniş planına görə taksitlərin dəyərlərini hazırlayır.
+
+        İlkin ödəniş başlama tarixinə düşür, qalıq isə aylıq taksitlərə bərabər
+        bölünür; yuvarlaqlaşdırma fərqi son taksitə əlavə olunur. Fərdi plan
+        üçün taksitlər əl ilə daxil edilir.
+        """
         self.ensure_one()
+        if self.payment_plan == 'custom' or self.total_amount <= 0:
+            return []
         
-        future_lessons = self.group_id.lesson_day_ids.filtered(
-            lambda l: l.lesson_date >= fields.Date.today() and l.status == 'scheduled'
-        )
+        amounts = []
+        remaining = self.total_amount
+        if self.payment_plan in ('partial', 'installment') and self.initial_payment > 0:
+            initial = min(self.initial_payment, self.total_amount)
+            amounts.append(initial)
+            remaining -= initial
+        
+        count = self.installment_count if self.payment_plan == 'installment' else 1
+        count = max(count, 1)
+        if remaining > 0:
+            part = float_round(remaining / count, precision_digits=2, rounding_method='DOWN')
+            amounts.extend([part] * (count - 1))
+            amounts.append(float_round(remaining - part * (count - 1), precision_digits=2))
+        
+        # Birinci məbləğ başlama tarixinə, qalanları hər növbəti aya düşür
+        return [{
+            'sequence': index + 1,
+            'due_date': self.join_date + relativedelta(months=index),
+            'amount': amount,
+        } for index, amount in enumerate(amounts) if amount > 0]
+    
+    def generate_installments(self):
+        """Üzvlərin taksit qrafikini toplu şəkildə yenidən qurur.
+
+        Mövcud taksitlər silinir, yeniləri bir ``create`` ilə yaradılır və
+        statusları ödənişlərə görə bir sorğu ilə təyin olunur. Fərdi plan
+        üzvlərinin əl ilə daxil edilmiş taksitlərinə toxunulmur.
+        """
+        members = self.filtered(lambda m: m.payment_plan != 'custom')
+        Installment = self.env['group.member.installment']
+        if not members:
+            return Installment
+        
+        existing = members.filtered('id').installment_ids
+        if existing:
+            existing.unlink()
+        
+        installments = Installment.create([
+            dict(vals, member_id=member.id)
+            for member in members
+            for vals in member._prepare_installment_vals()
+        ])
+        Installment._update_states(members)
+        return installments
+    
+    def _remove_future_attendance(self):
+        """Gələcək dərslər üçün üzvlərin devamiyyət qeydlərini sil"""
+        if not self:
+            return
         
-        # Gələcək dərslər üçün devamiyyət qeydlərini sil
+        # Gələcək planlaşdırılmış dərslər üçün devamiyyət qeydlərini sil
         attendances_to_remove = self.env['course.lesson.attendance'].search([
-            ('lesson_day_id', 'in', future_lessons.ids),
-            ('student_id', '=', self.id)
+            ('student_id', 'in', self.ids),
+            ('lesson_date', '>=', fields.Date.today()),
+            ('lesson_status', '=', 'scheduled'),
         ])
         
         if attendances_to_remove:
@@ -162,10 +279,26 @@ class CourseGroupMember(models.Model):
     
     @api.depends('payment_ids', 'payment_ids.amount', 'payment_ids.is_confirmed', 'total_amount')
     def _compute_payment_status(self):
+        # Təsdiqlənmiş ödənişlərin cəmini bütün üzvlər üçün bir qruplaşdırılmış sorğu ilə hesabla
+        saved_members = self.filtered('id')
+        paid_by_member = {}
+        if saved_members:
+            paid_by_member = {
+                member.id: amount
+                for member, amount in self.env['group.member.payment']._read_group(
+                    [('member_id', 'in', saved_members.ids), ('is_confirmed', '=', True)],
+                    ['member_id'],
+                    ['amount:sum'],
+                )
+            }
+        
         for member in self:
-            # Təsdiqlənmiş ödənişlərin cəmini hesabla
-            confirmed_payments = member.payment_ids.filtered('is_confirmed')
-            member.paid_amount = sum(confirmed_payments.mapped('amount'))
+            if member.id:
+                member.paid_amount = paid_by_member.get(member.id, 0.0)
+            else:
+                # Formada yeni (saxlanılmamış) qeyd - ödənişləri yaddaşdan topla
+                confirmed_payments = member.payment_ids.filtered('is_confirmed')
+                member.paid_amount = sum(confirmed_payments.mapped('amount'))
             
             # Qalan məbləği hesabla
             member.remaining_amount = member.total_amount - member.paid_amount
@@ -184,8 +317,14 @@ class CourseGroupMember(models.Model):
                 member.payment_status = 'partial'
     
     def _update_payment_status(self):
-        """Ödəniş statusunu yenilə - payment model tərəfindən çağırılır"""
-        self._compute_payment_status()
+        """Ödəniş statusunu yenidən hesablamaq üçün işarələ.
+
+        Hesablama dərhal aparılmır: işarələnmiş üzvlər növbəti flush zamanı
+        bir dəfə və toplu şəkildə yenilənir. Ödəniş dəyişiklikləri isə
+        ``@api.depends`` vasitəsilə avtomatik işarələnir.
+        """
+        for fname in ('paid_amount', 'remaining_amount', 'payment_status'):
+            self.env.add_to_compute(self._fields[fname], self)
     
     def action_add_payment(self):
         """Yeni ödəniş əlavə etmək üçün wizard açar"""
@@ -210,4 +349,15 @@ class CourseGroupMember(models.Model):
             'view_mode': 'list,form',
             'domain': [('member_id', '=', self.id)],
             'context': {'default_member_id': self.id}
+        }
+    
+    def action_view_installments(self):
+        """Bu üzvün taksit qrafikini göstər"""
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'{self.student_name.display_name} - Taksitlər',
+            'res_model': 'group.member.installment',
+            'view_mode': 'list',
+            'domain': [('member_id', '=', self.id)],
+            'context': {'default_member_id': self.id}
         }
\ No newline at end of file
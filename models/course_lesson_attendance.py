@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every
+from odoo.tools.sql import create_index
 
 
 class CourseLessonAttendance(models.Model):
@@ -20,36 +21,41 @@ class CourseLessonAttendance(models.Model):
         required=True,
         ondelete='cascade'
     )
-    student_name = fields.Char(string='Tələbə Adı', related='student_id.student_name.display_name', store=True, readonly=True)
+    # Ad dəyişəndə sinxron yenilənmir - bax edde.name.recompute.queue
+    student_name = fields.Char(string='Tələbə Adı', compute='_compute_student_name', store=True, readonly=True)
     lesson_date = fields.Date(string='Dərs Tarixi', related='lesson_day_id.lesson_date', store=True, readonly=True)
     group_id = fields.Many2one('course.group', string='Qrup', related='lesson_day_id.group_id', store=True, readonly=True)
     lesson_status = fields.Selection(string='Dərs Statusu', related='lesson_day_id.status', store=True, readonly=True)
     is_present = fields.Boolean(string='İştirak', default=True)
     attendance_status = fields.Char(string='İştirak Statusu', compute='_compute_attendance_status', store=True)
-    present_count = fields.Integer(string='İştirak Sayı', compute='_compute_attendance_counts', store=True)
-    absent_count = fields.Integer(string='Qeyb Sayı', compute='_compute_attendance_counts', store=True)
     excuse = fields.Char(string='Bəhanə')
     notes = fields.Text(string='Qeydlər')
     
     # Computed fields
     display_name = fields.Char(string='Ad', compute='_compute_display_name', store=True)
 
+    _sql_constraints = [
+        ('lesson_day_student_unique', 'unique(lesson_day_id, student_id)',
+         'Bu tələbənin bu dərs günü üçün artıq devamiyyət qeydi var!'),
+    ]
+
+    def init(self):
+        # (lesson_day_id, student_id) unikal indeksi dərs günü üzrə axtarışları əhatə edir;
+        # üzv üzrə axtarışlar (gələcək devamiyyətin silinməsi) üçün ayrıca indeks
+        create_index(self.env.cr, 'course_lesson_attendance_student_date_idx',
+                     self._table, ['student_id', 'lesson_date'])
+
+    @api.depends('student_id.student_name')
+    def _compute_student_name(self):
+        for record in self:
+            record.student_name = record.student_id.student_name.display_name
+    
     @api.depends('is_present')
     def _compute_attendance_status(self):
         for record in self:
             record.attendance_status = "Yes" if record.is_present else "No"
     
-    @api.depends('is_present')
-    def _compute_attendance_counts(self):
-        for record in self:
-            if record.is_present:
-                record.present_count = 1
-                record.absent_count = 0
-            else:
-                record.present_count = 0
-                record.absent_count = 1
-
-    @api.depends('student_id', 'lesson_day_id', 'is_present')
+    @api.depends('student_id', 'student_name', 'lesson_day_id', 'is_present')
     def _compute_display_name(self):
         for record in self:
             if record.student_id and record.lesson_day_id:
@@ -58,18 +64,47 @@ class CourseLessonAttendance(models.Model):
             else:
                 record.display_name = "Yeni İştirak Qeydi"
 
-    @api.constrains('lesson_day_id', 'student_id')
-    def _check_unique_attendance(self):
-        # Yalnız create zamanı check et, update zamanı yox
-        for record in self:
-            if not record.id:  # Yeni qeyd yaradılırsa
-                existing = self.search([
-                    ('lesson_day_id', '=', record.lesson_day_id.id),
-                    ('student_id', '=', record.student_id.id)
-                ])
-                if existing:
-                    raise ValidationError(
-                        f"Bu tələbənin ({record.student_name}) "
-                        f"bu dərs günü üçün ({record.lesson_day_id.lesson_date}) "
-                        f"artıq devamiyyət qeydi var!"
-                    )
\ No newline at end of file
+    @api.model
+    def _create_missing(self, vals_list):
+        """Devamiyyət qeydlərini toplu əlavə edir, mövcud (dərs günü, tələbə) cütlərini ötürür.
+
+        Təkrarlar Python-da yoxlanılmır: ``ON CONFLICT DO NOTHING`` unikal indeksə
+        söykənir, ona görə paralel işçilər eyni cütü iki dəfə yarada bilməz.
+        Yalnız həqiqətən əlavə olunan qeydlər qaytarılır.
+        """
+        if not vals_list:
+            return self.browse()
+
+        uid = self.env.uid
+        now = self.env.cr.now()
+        ids = []
+        for vals_chunk in split_every(5000, vals_list):
+            rows = SQL(', ').join(
+                SQL(
+                    '(%s, %s, %s, %s, %s, %s, %s)',
+                    vals['lesson_day_id'], vals['student_id'], vals.get('is_present', True),
+                    uid, now, uid, now,
+                )
+                for vals in vals_chunk
+            )
+            self.env.cr.execute(SQL(
+                """
+                INSERT INTO %s (lesson_day_id, student_id, is_present,
+                                create_uid, create_date, write_uid, write_date)
+                VALUES %s
+                ON CONFLICT (lesson_day_id, student_id) DO NOTHING
+                RETURNING id
+                """,
+                SQL.identifier(self._table), rows,
+            ))
+            ids.extend(row[0] for row in self.env.cr.fetchall())
+
+        records = self.browse(ids)
+        if records:
+            # ORM-dən kənar əlavə olunduğu üçün keşi və saxlanılan hesablanmış sahələri yenilə
+            self.env['course.group.lesson.day'].invalidate_model(['attendance_list'])
+            records.modified(['lesson_day_id', 'student_id', 'is_present'], create=True)
+            for field in self._fields.values():
+                if field.store and field.compute:
+                    self.env.add_to_compute(field, records)
+        return records
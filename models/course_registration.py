@@ -1,7 +1,15 @@
+import csv
+import logging
+import time
+from collections import defaultdict
+
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL, email_normalize, split_every
 from datetime import datetime, timedelta
 
+_logger = logging.getLogger(__name__)
+
 class CourseRegistration(models.Model):
     _name = 'edde.course.registration'
     _description = 'Course Registration'
@@ -17,7 +25,10 @@ class CourseRegistration(models.Model):
     
     # Qrup üzvlüyü - köhnə group_id sahəsini silib yeni sistem
     group_memberships = fields.One2many('course.group.member', 'student_name', string='Qrup Üzvlüyü')
-    active_groups = fields.Many2many('course.group', compute='_compute_active_groups', string='Aktiv Qruplar')
+    active_groups = fields.Many2many(
+        'course.group', 'edde_registration_active_group_rel', 'registration_id', 'group_id',
+        compute='_compute_active_groups', store=True, string='Aktiv Qruplar'
+    )
     
     schedule_ids = fields.One2many('course.lesson.schedule', 'lesson_id', string="Həftəlik Qrafik")
 
@@ -61,9 +72,10 @@ class CourseRegistration(models.Model):
     
     # Financial Information
     monthly_payment = fields.Float('Ödəniş')
+    last_debt_reminder_date = fields.Date('Son borc xatırlatması', readonly=True, copy=False)
     initial_result = fields.Text('İlkin nəticə')
 
-    @api.depends('student_code', 'student_id')
+    @api.depends('student_code', 'student_id', 'student_id.name')
     def _compute_display_name(self):
         for registration in self:
             if registration.student_code and registration.student_id:
@@ -75,7 +87,7 @@ class CourseRegistration(models.Model):
             else:
                 registration.display_name = "Yeni qeydiyyat"
                 
-    @api.depends('group_memberships')
+    @api.depends('group_memberships.status', 'group_memberships.group_id')
     def _compute_active_groups(self):
         for registration in self:
             active_memberships = registration.group_memberships.filtered(lambda m: m.status == 'active')
@@ -86,25 +98,6 @@ class CourseRegistration(models.Model):
         for lesson in self:
             lesson.total_attendances = len(lesson.attendance_ids)
 
-    def update_schedule_from_groups(self):
-        """Aktiv qrup üzvlüklərindən həftəlik qrafik yaradır"""
-        self.schedule_ids = [(5, 0, 0)]  # Köhnə qrafiki sil
-        
-        schedule_vals = []
-        for membership in self.group_memberships.filtered(lambda m: m.status == 'active'):
-            group = membership.group_id
-            for group_schedule in group.schedule_ids.filtered(lambda s: s.is_active):
-                schedule_vals.append((0, 0, {
-                    'day_of_week': group_schedule.day_of_week,
-                    'start_time': group_schedule.start_time,
-                    'end_time': group_schedule.end_time,
-                    'is_active': True,
-                    'notes': f"Qrup: {group.name} ({membership.join_date})"
-                }))
-        
-        if schedule_vals:
-            self.schedule_ids = schedule_vals
-
     @api.onchange('student_id')
     def _onchange_student_id(self):
         if self.student_id:
@@ -116,59 +109,388 @@ class CourseRegistration(models.Model):
             self.course = self.student_id.course_id
             self.source = self.student_id.source_id
     
-    @api.model
-    def create(self, vals):
-        if 'student_code' not in vals or vals['student_code'] == '/':
-            vals['student_code'] = self.env['ir.sequence'].next_by_code('edde.course.registration') or 'STU/'
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Tələbə kodları bütün qeydlər üçün bir dəfəyə ayrılır
+        vals_without_code = [vals for vals in vals_list if vals.get('student_code', '/') == '/']
+        if vals_without_code:
+            codes = self._reserve_student_codes(len(vals_without_code))
+            for vals, code in zip(vals_without_code, codes):
+                vals['student_code'] = code or 'STU/'
         
-        record = super(CourseRegistration, self).create(vals)
-        record._check_and_set_start_date()
-        return record
+        # Başlama tarixi sonradan ayrıca write etmək əvəzinə dəyərlərə yazılır
+        today = fields.Date.today()
+        for vals in vals_list:
+            if vals.get('status') == 'confirmed' and not vals.get('start_date'):
+                vals['start_date'] = today
+        
+        return super(CourseRegistration, self).create(vals_list)
 
     def write(self, vals):
         res = super(CourseRegistration, self).write(vals)
         if 'status' in vals:
             self._check_and_set_start_date()
+        if 'student_code' in vals or 'student_id' in vals:
+            # Ad nüsxələri (devamiyyət, ödəniş, üzvlük) cron ilə yenilənir
+            self.env['edde.name.recompute.queue']._enqueue(self)
         return res
 
     def _check_and_set_start_date(self): 
-        for rec in self:
-            if rec.status == 'confirmed' and not rec.start_date:
-                rec.start_date = fields.Date.today()
+        self.filtered(
+            lambda rec: rec.status == 'confirmed' and not rec.start_date
+        ).write({'start_date': fields.Date.today()})
+    
+    @api.model
+    def _reserve_student_codes(self, count):
+        """``count`` ədəd tələbə kodunu bir dəfəyə ayırır.
+
+        Standart (PostgreSQL sequence əsaslı) ardıcıllıqda nömrələr bir
+        ``nextval`` sorğusu ilə götürülür. Tarix aralıqlı və ya boşluqsuz
+        ardıcıllıqlarda hər kod ``next_by_id`` ilə alınır.
+        """
+        company_id = self.env.company.id
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'edde.course.registration'),
+            ('company_id', 'in', [company_id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [False] * count
+        
+        if sequence.implementation != 'standard' or sequence.use_date_range:
+            return [sequence.next_by_id() for _index in range(count)]
+        
+        self.env.cr.execute(SQL(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            f'ir_sequence_{sequence.id:03d}', count,
+        ))
+        return [sequence.get_next_char(number) for number, in self.env.cr.fetchall()]
+    
+    @api.model
+    def import_csv(self, file_obj, chunk_size=1000, delimiter=','):
+        """CSV faylından qeydiyyatları hissə-hissə idxal edir.
+
+        Sətirlər axınla oxunur, hər hissə ayrıca yaradılır və sonra keş
+        təmizlənir ki, yaddaş hissə ölçüsü ilə məhdud qalsın. Sahə izləməsi
+        və hər qeyd üçün ayrıca yaradılma mesajı söndürülür - əvəzində hər
+        hissənin qeydlərinə bir toplu ``_message_log_batch`` çağırışı ilə
+        import qeydi yazılır. Hər hissənin sürəti loga yazılır.
+
+        Sütunlar: name, email, phone, phone2, father_name, id_card_number,
+        birth_date, gender, program, course, source, country, status, note.
+        status və gender açar və ya ad ilə, birth_date isə YYYY-MM-DD və ya
+        DD.MM.YYYY formatında verilir. Yanlış dəyər sətir nömrəsi ilə
+        UserError qaldırır və heç bir qeyd yaradılmır.
+        """
+        lookups = self._get_import_lookups()
+        Registration = self.with_context(
+            tracking_disable=True,
+            mail_create_nolog=True,
+            mail_create_nosubscribe=True,
+            mail_notrack=True,
+        )
+        
+        total_created = 0
+        chunk_count = 0
+        started_at = time.perf_counter()
+        reader = csv.DictReader(file_obj, delimiter=delimiter)
+        numbered_rows = ((reader.line_num, row) for row in reader)
+        for rows in split_every(chunk_size, numbered_rows):
+            chunk_started_at = time.perf_counter()
+            registrations = Registration._import_rows(rows, lookups)
+            registrations._message_log_batch(
+                bodies={registration.id: "Qeydiyyat CSV faylından idxal edildi." for registration in registrations},
+            )
+            self.env.flush_all()
+            self.env.invalidate_all()
+            
+            chunk_count += 1
+            total_created += len(registrations)
+            elapsed = time.perf_counter() - chunk_started_at
+            _logger.info(
+                "Qeydiyyat importu: hissə %s - %s qeyd, %.2f san. (%.0f qeyd/san.)",
+                chunk_count, len(registrations), elapsed, len(registrations) / elapsed if elapsed else 0,
+            )
+        
+        duration = time.perf_counter() - started_at
+        _logger.info("Qeydiyyat importu bitdi: %s qeyd, %s hissə, %.2f san.",
+                     total_created, chunk_count, duration)
+        return {'created': total_created, 'chunks': chunk_count, 'duration': duration}
+    
+    @api.model
+    def _get_import_lookups(self):
+        """Import zamanı adla axtarılan kataloqları ad → id xəritəsi kimi qaytarır"""
+        return {
+            field_name: {
+                record.name.strip().lower(): record.id
+                for record in self.env[model_name].search([])
+            }
+            for field_name, model_name in (
+                ('program', 'course.program'),
+                ('course', 'course.course'),
+                ('source', 'course.source'),
+                ('country', 'course.country'),
+            )
+        }
+    
+    @api.model
+    def _parse_import_row(self, line_num, row):
+        """CSV sətrinin seçim və tarix dəyərlərini yoxlayıb çevirir.
+
+        Seçim sahələri açar və ya ad ilə (böyük-kiçik hərf fərqi olmadan)
+        qəbul edilir. ``{sahə: dəyər}`` qaytarır.
+        """
+        vals = {}
+        for fname in ('status', 'gender'):
+            value = (row.get(fname) or '').strip()
+            if not value:
+                continue
+            options = {}
+            for key, label in self._fields[fname]._description_selection(self.env):
+                options[key.lower()] = key
+                options[label.lower()] = key
+            if value.lower() not in options:
+                raise UserError(
+                    f"Sətir {line_num}: '{value}' {self._fields[fname].string} üçün düzgün dəyər deyil!"
+                )
+            vals[fname] = options[value.lower()]
+        
+        birth_date = (row.get('birth_date') or '').strip()
+        if birth_date:
+            for date_format in ('%Y-%m-%d', '%d.%m.%Y'):
+                try:
+                    vals['birth_date'] = datetime.strptime(birth_date, date_format).date()
+                    break
+                except ValueError:
+                    continue
+            else:
+                raise UserError(
+                    f"Sətir {line_num}: '{birth_date}' tarixi YYYY-MM-DD və ya DD.MM.YYYY formatında olmalıdır!"
+                )
+        return vals
+    
+    @api.model
+    def _import_rows(self, rows, lookups):
+        """Bir hissə (sətir nömrəsi, CSV sətri) cütündən tələbə kontaktlarını
+        və qeydiyyatları toplu yaradır"""
+        # Yanlış sətir kontakt yaradılmazdan əvvəl aşkarlanır
+        parsed_rows = [
+            (row, self._parse_import_row(line_num, row))
+            for line_num, row in rows
+            if (row.get('name') or '').strip()
+        ]
+        if not parsed_rows:
+            return self.browse()
+        rows = [row for row, _parsed in parsed_rows]
+        
+        # Mövcud kontaktları normallaşdırılmış email-ə görə bir sorğu ilə tap
+        normalized_emails = [email_normalize(row.get('email') or '') for row in rows]
+        partner_by_email = {}
+        if any(normalized_emails):
+            for partner in self.env['res.partner'].search([
+                ('email_normalized', 'in', [email for email in normalized_emails if email])
+            ]):
+                partner_by_email.setdefault(partner.email_normalized, partner.id)
+        
+        # Yeni kontaktlar: email-i olan sətirlər üçün bir email - bir kontakt
+        new_partner_vals = {}
+        for row, email in zip(rows, normalized_emails):
+            if email in partner_by_email:
+                continue
+            new_partner_vals.setdefault(email or id(row), {
+                'name': row['name'].strip(),
+                'email': (row.get('email') or '').strip() or False,
+                'phone': (row.get('phone') or '').strip() or False,
+            })
+        new_partners = self.env['res.partner'].create(list(new_partner_vals.values()))
+        partner_by_key = dict(zip(new_partner_vals, new_partners.ids))
+        
+        vals_list = []
+        for (row, parsed_vals), normalized_email in zip(parsed_rows, normalized_emails):
+            vals = {
+                'student_id': (partner_by_email.get(normalized_email)
+                               or partner_by_key[normalized_email or id(row)]),
+                'email': (row.get('email') or '').strip() or False,
+                'status': 'draft',
+                **parsed_vals,
+            }
+            for fname in ('phone', 'phone2', 'father_name', 'id_card_number', 'note'):
+                value = (row.get(fname) or '').strip()
+                if value:
+                    vals[fname] = value
+            for fname, ids_by_name in lookups.items():
+                value = (row.get(fname) or '').strip().lower()
+                if value in ids_by_name:
+                    vals[fname] = ids_by_name[value]
+            vals_list.append(vals)
+        return self.create(vals_list)
     
     def update_schedule_from_groups(self):
         """Aktiv qrup üzvlüklərindən həftəlik qrafik yaradır"""
-        self.ensure_one()
-        
-        # Mövcud qrafiki sil
-        self.schedule_ids.unlink()
-        
-        # Aktiv qrup üzvlüklərindən qrafik yarat
-        schedule_vals = []
-        for membership in self.group_memberships.filtered(lambda m: m.status == 'active'):
-            group = membership.group_id
-            if group.schedule_ids:
-                for group_schedule in group.schedule_ids.filtered(lambda s: s.is_active):
-                    schedule_vals.append((0, 0, {
-                        'day_of_week': group_schedule.day_of_week,
-                        'start_time': group_schedule.start_time,
-                        'end_time': group_schedule.end_time,
-                        'is_active': True,
-                        'notes': f"Qrup: {group.name} (Başlama: {membership.join_date})"
-                    }))
-        
-        if schedule_vals:
-            self.schedule_ids = schedule_vals
-            
+        created, updated, removed = self._rebuild_schedule_from_groups(keep_manual=False)
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': 'Uğurlu',
-                'message': f'{len(schedule_vals)} qrafik yaradıldı.',
+                'message': f'{created} qrafik yaradıldı, {updated} yeniləndi, {removed} silindi.',
                 'type': 'success',
             }
         }
+    
+    def _rebuild_schedule_from_groups(self, keep_manual=True):
+        """Tələbələrin həftəlik qrafikini aktiv qrup üzvlüklərinə uyğunlaşdırır.
+
+        Üzvlüklər və qrup qrafikləri bir SQL sorğusu ilə oxunur, mövcud
+        qrafik sətirləri ilə (tələbə, qrup qrafiki) açarına görə müqayisə
+        edilir və yalnız fərq toplu tətbiq olunur. ``keep_manual`` olduqda
+        qrup qrafikinə bağlı olmayan (əl ilə əlavə edilmiş) sətirlərə toxunulmur.
+
+        ``(yaradılan, yenilənən, silinən)`` saylarını qaytarır.
+        """
+        if not self:
+            return 0, 0, 0
+        
+        Schedule = self.env['course.lesson.schedule']
+        Member = self.env['course.group.member']
+        GroupSchedule = self.env['course.group.schedule']
+        Member.flush_model(['student_name', 'group_id', 'status', 'join_date'])
+        GroupSchedule.flush_model(['group_id', 'day_of_week', 'start_time', 'end_time', 'is_active'])
+        self.env['course.group'].flush_model(['name'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT member.student_name, group_schedule.id, group_schedule.day_of_week,
+                   group_schedule.start_time, group_schedule.end_time,
+                   course_group.name, member.join_date
+              FROM %s member
+              JOIN %s course_group ON course_group.id = member.group_id
+              JOIN %s group_schedule ON group_schedule.group_id = member.group_id
+                                    AND group_schedule.is_active
+             WHERE member.status = 'active'
+               AND member.student_name IN %s
+            """,
+            SQL.identifier(Member._table),
+            SQL.identifier(self.env['course.group']._table),
+            SQL.identifier(GroupSchedule._table),
+            tuple(self.ids),
+        ))
+        planned = {
+            (registration_id, group_schedule_id): {
+                'day_of_week': day_of_week,
+                'start_time': start_time,
+                'end_time': end_time,
+                'is_active': True,
+                'notes': f"Qrup: {group_name} (Başlama: {join_date})",
+            }
+            for registration_id, group_schedule_id, day_of_week, start_time, end_time, group_name, join_date
+            in self.env.cr.fetchall()
+        }
+        
+        schedule_fields = ['lesson_id', 'group_schedule_id', 'day_of_week', 'start_time',
+                           'end_time', 'is_active', 'notes']
+        existing = Schedule.search_fetch([('lesson_id', 'in', self.ids)], schedule_fields)
+        
+        to_remove = Schedule
+        to_update = defaultdict(lambda: Schedule)
+        for schedule in existing:
+            if not schedule.group_schedule_id and keep_manual:
+                continue
+            vals = planned.pop((schedule.lesson_id.id, schedule.group_schedule_id.id), None)
+            if vals is None:
+                to_remove |= schedule
+            elif any(schedule[fname] != value for fname, value in vals.items()):
+                to_update[tuple(vals.items())] |= schedule
+        
+        to_remove.unlink()
+        for vals_items, schedules in to_update.items():
+            schedules.write(dict(vals_items))
+        Schedule.create([
+            dict(vals, lesson_id=registration_id, group_schedule_id=group_schedule_id)
+            for (registration_id, group_schedule_id), vals in planned.items()
+        ])
+        return len(planned), sum(len(schedules) for schedules in to_update.values()), len(to_remove)
+    
+    @api.model
+    def _get_debt_reminder_ids(self, interval_days=7):
+        """Borc xatırlatması göndəriləcək qeydiyyatları bir SQL sorğusu ilə seçir.
+
+        Üzvün gecikmiş taksiti olmalıdır; taksit qrafiki olmayan (fərdi plan)
+        üzvlər üçün qalıq borc kifayətdir. Son ``interval_days`` gün ərzində
+        xatırlatma almış və email-i olmayan tələbələr ötürülür.
+        """
+        Member = self.env['course.group.member']
+        Installment = self.env['group.member.installment']
+        self.flush_model(['student_id', 'status', 'last_debt_reminder_date'])
+        self.env['res.partner'].flush_model(['email'])
+        Member.flush_model(['student_name', 'remaining_amount'])
+        Installment.flush_model(['member_id', 'state'])
+        
+        cutoff = fields.Date.context_today(self) - timedelta(days=interval_days)
+        self.env.cr.execute(SQL(
+            """
+            SELECT registration.id
+              FROM %(table)s registration
+              JOIN res_partner partner ON partner.id = registration.student_id
+             WHERE registration.status IS DISTINCT FROM 'cancelled'
+               AND COALESCE(partner.email, '') != ''
+               AND (registration.last_debt_reminder_date IS NULL
+                    OR registration.last_debt_reminder_date <= %(cutoff)s)
+               AND EXISTS (
+                    SELECT 1
+                      FROM %(member_table)s member
+                     WHERE member.student_name = registration.id
+                       AND member.remaining_amount > 0
+                       AND (EXISTS (SELECT 1 FROM %(installment_table)s installment
+                                     WHERE installment.member_id = member.id
+                                       AND installment.state = 'overdue')
+                            OR NOT EXISTS (SELECT 1 FROM %(installment_table)s installment
+                                            WHERE installment.member_id = member.id))
+                   )
+          ORDER BY registration.id
+            """,
+            table=SQL.identifier(self._table),
+            member_table=SQL.identifier(Member._table),
+            installment_table=SQL.identifier(Installment._table),
+            cutoff=cutoff,
+        ))
+        return [row[0] for row in self.env.cr.fetchall()]
+    
+    @api.model
+    def _send_debt_reminders(self, chunk_size=200, auto_commit=True, interval_days=7):
+        """Borclu tələbələrə xatırlatma emaillərini hissə-hissə növbəyə qoyur.
+
+        Hər hissə şablondan toplu render olunur, ``mail.mail`` qeydləri bir
+        yaradılma ilə növbəyə yazılır və xatırlatma tarixi qeyd olunur.
+        ``auto_commit`` ilə hər hissədən sonra commit edilir - iş yarımçıq
+        kəsilsə, növbəti işə salınmada artıq göndərilənlər seçilmir.
+        Emaillər poçt növbəsi cron-u ilə göndərilir.
+        """
+        template = self.env.ref(f'{self._module}.mail_template_debt_reminder', raise_if_not_found=False)
+        if not template:
+            return 0
+        
+        registration_ids = self._get_debt_reminder_ids(interval_days=interval_days)
+        today = fields.Date.context_today(self)
+        Registration = self.with_context(tracking_disable=True)
+        sent_count = 0
+        for chunk_ids in split_every(chunk_size, registration_ids):
+            mails = template.send_mail_batch(list(chunk_ids), force_send=False)
+            Registration.browse(chunk_ids).write({'last_debt_reminder_date': today})
+            sent_count += len(mails)
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            _logger.info("Borc xatırlatması: %s/%s email növbəyə qoyuldu", sent_count, len(registration_ids))
+        
+        if sent_count:
+            mail_cron = self.env.ref('mail.ir_cron_mail_scheduler_action', raise_if_not_found=False)
+            if mail_cron:
+                mail_cron._trigger()
+        return sent_count
+    
+    @api.model
+    def _cron_send_debt_reminders(self, chunk_size=200, auto_commit=True):
+        """Borclu tələbələrə gündəlik xatırlatma"""
+        self._send_debt_reminders(chunk_size=chunk_size, auto_commit=auto_commit)
 
 class CourseLessonSchedule(models.Model):
     _name = 'course.lesson.schedule'
@@ -178,6 +500,10 @@ class CourseLessonSchedule(models.Model):
     lesson_id = fields.Many2one('edde.course.registration', string="Dərs", required=True, ondelete='cascade')
     student_id = fields.Many2one(related='lesson_id.student_id', string="Müştəri", store=True)
     
+    # Qrup qrafikindən yaradılıbsa - qrafik silindikdə bu sətir də silinir
+    group_schedule_id = fields.Many2one('course.group.schedule', string="Qrup Qrafiki",
+                                        ondelete='cascade', index='btree_not_null', readonly=True)
+    
     # Həftənin günü
     day_of_week = fields.Selection([
         ('0', 'Bazar ertəsi'),
@@ -10,37 +10,7 @@ class CrmLead(models.Model):
         """
         self.ensure_one()
         
-        # Əvvəlcə partner yarat (əgər yoxdursa)
-        if not self.partner_id:
-            partner_vals = {
-                'name': self.contact_name or self.name,
-                'email': self.email_from,
-                'phone': self.phone,
-                'mobile': self.mobile,
-            }
-            partner = self.env['res.partner'].create(partner_vals)
-            self.write({'partner_id': partner.id})
-        
-        # İndi həmin partner üçün tələbə qeydiyyatı yarat
-        vals = {
-            'student_id': self.partner_id.id,
-            'phone': self.partner_id.phone,
-            'phone2': self.partner_id.mobile,
-            'email': self.partner_id.email,
-            'note': f"Lead-dən yaradılıb: {self.name}\n" + (self.description or ''),
-            # Kontaktdakı sahələri əlavə et
-            'program': self.partner_id.program_id.id if self.partner_id.program_id else False,
-            'university': self.partner_id.university_id.id if self.partner_id.university_id else False,
-            'country': self.partner_id.student_country_id.id if self.partner_id.student_country_id else False,
-            'course': self.partner_id.course_id.id if self.partner_id.course_id else False,
-            'source': self.partner_id.source_id.id if self.partner_id.source_id else False,
-        }
-        
-        # Tələbə qeydiyyatı yarat
-        registration = self.env['edde.course.registration'].create(vals)
-        
-        # Lead-i Won olaraq qeyd et
-        self.action_set_won()
+        registration = self._create_student_registrations()
         
         # Qeydiyyat formasını aç
         return {
@@ -50,4 +20,92 @@ class CrmLead(models.Model):
             'res_id': registration.id,
             'type': 'ir.actions.act_window',
             'target': 'current',
-        }
\ No newline at end of file
+        }
+    
+    def action_create_students_from_leads(self):
+        """Seçilmiş lead-lərdən toplu tələbə qeydiyyatı yaradır"""
+        registrations = self._create_student_registrations()
+        return {
+            'name': 'Tələbə Qeydiyyatları',
+            'view_mode': 'list,form',
+            'res_model': 'edde.course.registration',
+            'domain': [('id', 'in', registrations.ids)],
+            'type': 'ir.actions.act_window',
+            'target': 'current',
+        }
+    
+    def _create_student_registrations(self):
+        """Lead-lər üçün kontakt və tələbə qeydiyyatlarını toplu yaradır.
+
+        Kontaktı olmayan lead-lər üçün mövcud kontaktlar normallaşdırılmış
+        email və ya telefona görə bir sorğu ilə axtarılır, tapılmayanlar
+        bir ``create`` ilə yaradılır. Bütün lead-lər birlikdə qazanılmış
+        kimi işarələnir.
+        """
+        self._assign_student_partners()
+        
+        # İndi həmin kontaktlar üçün tələbə qeydiyyatı yarat
+        registrations = self.env['edde.course.registration'].create([
+            dict(
+                lead.partner_id._prepare_registration_vals(),
+                note=f"Lead-dən yaradılıb: {lead.name}\n" + (lead.description or ''),
+            )
+            for lead in self
+        ])
+        
+        # Lead-ləri Won olaraq qeyd et
+        self.action_set_won()
+        return registrations
+    
+    def _assign_student_partners(self):
+        """Kontaktı olmayan lead-lərə mövcud və ya yeni kontakt təyin edir"""
+        leads = self.filtered(lambda lead: not lead.partner_id)
+        if not leads:
+            return
+        
+        # Mövcud kontaktları bir sorğu ilə tap
+        emails = [email for email in leads.mapped('email_normalized') if email]
+        phones = [phone for phone in leads.mapped('phone_sanitized') if phone]
+        partner_by_email, partner_by_phone = {}, {}
+        if emails or phones:
+            partners = self.env['res.partner'].search_fetch(
+                ['|', ('email_normalized', 'in', emails), ('phone_sanitized', 'in', phones)],
+                ['email_normalized', 'phone_sanitized'],
+                order='id',
+            )
+            for partner in partners:
+                if partner.email_normalized:
+                    partner_by_email.setdefault(partner.email_normalized, partner)
+                if partner.phone_sanitized:
+                    partner_by_phone.setdefault(partner.phone_sanitized, partner)
+        
+        # Tapılmayanlar üçün kontaktlar - eyni email/telefonlu lead-lər bir kontakt paylaşır
+        new_partner_vals = {}
+        for lead in leads:
+            if partner_by_email.get(lead.email_normalized) or partner_by_phone.get(lead.phone_sanitized):
+                continue
+            new_partner_vals.setdefault(lead._get_partner_match_key(), {
+                'name': lead.contact_name or lead.name,
+                'email': lead.email_from,
+                'phone': lead.phone,
+                'mobile': lead.mobile,
+            })
+        new_partners = self.env['res.partner'].create(list(new_partner_vals.values()))
+        partner_by_key = dict(zip(new_partner_vals, new_partners))
+        
+        leads_by_partner = {}
+        for lead in leads:
+            partner = (
+                partner_by_email.get(lead.email_normalized)
+                or partner_by_phone.get(lead.phone_sanitized)
+                or partner_by_key[lead._get_partner_match_key()]
+            )
+            leads_by_partner[partner] = leads_by_partner.get(partner, self.browse()) | lead
+        
+        for partner, partner_leads in leads_by_partner.items():
+            partner_leads.write({'partner_id': partner.id})
+    
+    def _get_partner_match_key(self):
+        """Eyni kontakta aid lead-ləri qruplaşdırmaq üçün açar"""
+        self.ensure_one()
+        return self.email_normalized or self.phone_sanitized or ('lead', self.id)
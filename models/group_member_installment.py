@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+
+class GroupMemberInstallment(models.Model):
+    _name = 'group.member.installment'
+    _description = 'Qrup Üzvü Taksiti'
+    _order = 'due_date, sequence, id'
+
+    member_id = fields.Many2one('course.group.member', string='Qrup Üzvü', required=True, ondelete='cascade')
+    registration_id = fields.Many2one(related='member_id.student_name', string='Tələbə', store=True, readonly=True)
+    group_id = fields.Many2one(related='member_id.group_id', string='Qrup', store=True, readonly=True)
+    sequence = fields.Integer(string='Sıra', default=1)
+    due_date = fields.Date(string='Son Ödəniş Tarixi', required=True, index=True)
+    amount = fields.Float(string='Məbləğ', required=True)
+    # Hər ikisi _update_states tərəfindən bir SQL sorğusu ilə yazılır
+    residual_amount = fields.Float(string='Ödənilməmiş', readonly=True)
+    state = fields.Selection([
+        ('planned', 'Planlaşdırılıb'),
+        ('paid', 'Ödənilib'),
+        ('overdue', 'Gecikib'),
+    ], string='Status', default='planned', required=True, readonly=True)
+
+    def init(self):
+        # Üzv üzrə taksitlərin ardıcıllıqla toplanması (pəncərə funksiyası)
+        create_index(self.env.cr, 'group_member_installment_member_due_idx',
+                     self._table, ['member_id', 'due_date', 'sequence'])
+
+    @api.depends('member_id', 'due_date', 'amount')
+    def _compute_display_name(self):
+        for installment in self:
+            installment.display_name = (
+                f"{installment.member_id.display_name} - {installment.amount} AZN ({installment.due_date})"
+            )
+
+    @api.constrains('amount')
+    def _check_amount(self):
+        for installment in self:
+            if installment.amount <= 0:
+                raise ValidationError("Taksit məbləği müsbət olmalıdır!")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            vals.setdefault('residual_amount', vals.get('amount', 0.0))
+        return super().create(vals_list)
+
+    @api.model
+    def _update_states(self, members=None):
+        """Taksitlərin ödənilmə və gecikmə statusunu bir SQL sorğusu ilə yeniləyir.
+
+        Üzvün təsdiqlənmiş ödənişləri taksitləri tarix ardıcıllığı ilə örtür:
+        taksitlərin artan cəmi ödənilmiş məbləği keçmirsə taksit ödənilib,
+        əks halda son tarixi keçmiş taksit gecikmiş sayılır. ``members``
+        verilmədikdə bütün üzvlər yoxlanılır.
+        """
+        if members is not None and not members:
+            return self.browse()
+
+        self.env['course.group.member'].flush_model(['paid_amount'])
+        self.flush_model(['member_id', 'due_date', 'sequence', 'amount', 'residual_amount', 'state'])
+
+        member_filter = SQL()
+        if members is not None:
+            member_filter = SQL("WHERE line.member_id IN %s", tuple(members.ids))
+
+        self.env.cr.execute(SQL(
+            """
+            UPDATE %(table)s installment
+               SET state = plan.new_state,
+                   residual_amount = plan.new_residual,
+                   write_uid = %(uid)s,
+                   write_date = %(now)s
+              FROM (
+                    SELECT covered.id,
+                           CASE WHEN covered.unpaid <= 0.005 THEN 'paid'
+                                WHEN covered.due_date < %(today)s THEN 'overdue'
+                                ELSE 'planned' END AS new_state,
+                           ROUND(GREATEST(covered.unpaid, 0)::numeric, 2)::float8 AS new_residual
+                      FROM (
+                            SELECT line.id, line.due_date,
+                                   LEAST(line.amount,
+                                         SUM(line.amount) OVER (
+                                             PARTITION BY line.member_id
+                                             ORDER BY line.due_date, line.sequence, line.id
+                                         ) - COALESCE(member.paid_amount, 0)) AS unpaid
+                              FROM %(table)s line
+                              JOIN %(member_table)s member ON member.id = line.member_id
+                              %(member_filter)s
+                           ) covered
+                   ) plan
+             WHERE installment.id = plan.id
+               AND (installment.state IS DISTINCT FROM plan.new_state
+                    OR installment.residual_amount IS DISTINCT FROM plan.new_residual)
+         RETURNING installment.id
+            """,
+            table=SQL.identifier(self._table),
+            member_table=SQL.identifier(self.env['course.group.member']._table),
+            member_filter=member_filter,
+            today=fields.Date.context_today(self),
+            uid=self.env.uid,
+            now=self.env.cr.now(),
+        ))
+        updated = self.browse([row[0] for row in self.env.cr.fetchall()])
+        updated.invalidate_recordset(['state', 'residual_amount', 'write_uid', 'write_date'])
+        return updated
+
+    @api.model
+    def _cron_update_states(self):
+        """Gecikmiş taksitləri gecə işarələ"""
+        self._update_states()
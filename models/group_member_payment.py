@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 
 
 class GroupMemberPayment(models.Model):
@@ -11,8 +12,9 @@ class GroupMemberPayment(models.Model):
 
     # Əsas əlaqələr
     member_id = fields.Many2one('course.group.member', string='Qrup Üzvü', required=True, ondelete='cascade')
-    student_name = fields.Char(string='Tələbə Adı', related='member_id.student_name.display_name', store=True, readonly=True)
-    group_name = fields.Char(string='Qrup Adı', related='member_id.group_id.name', store=True, readonly=True)
+    # Ad dəyişəndə sinxron yenilənmir - bax edde.name.recompute.queue
+    student_name = fields.Char(string='Tələbə Adı', compute='_compute_names', store=True, readonly=True)
+    group_name = fields.Char(string='Qrup Adı', compute='_compute_names', store=True, readonly=True)
     
     # Üzv ödəniş məlumatları
     member_total_amount = fields.Float(string='Ümumi Məbləğ', related='member_id.total_amount', readonly=True)
@@ -50,6 +52,17 @@ class GroupMemberPayment(models.Model):
     # Computed fields
     display_name = fields.Char(string='Ad', compute='_compute_display_name', store=True)
     
+    def init(self):
+        # Üzv üzrə təsdiqlənmiş ödənişlərin cəmi
+        create_index(self.env.cr, 'group_member_payment_member_confirmed_idx',
+                     self._table, ['member_id', 'is_confirmed'])
+    
+    @api.depends('member_id.student_name', 'member_id.group_id')
+    def _compute_names(self):
+        for payment in self:
+            payment.student_name = payment.member_id.student_name.display_name
+            payment.group_name = payment.member_id.group_id.name
+    
     @api.depends('student_name', 'amount', 'payment_date')
     def _compute_display_name(self):
         for payment in self:
@@ -58,30 +71,28 @@ class GroupMemberPayment(models.Model):
             else:
                 payment.display_name = "Yeni Ödəniş"
     
-    @api.constrains('amount')
-    def _check_amount(self):
-        for payment in self:
-            if payment.amount <= 0:
-                raise ValidationError("Ödəniş məbləği müsbət olmalıdır!")
-    
-    @api.model
-    def create(self, vals):
-        """Ödəniş yaradıldıqda üzvün ödəniş məlumatlarını yenilə"""
-        payment = super().create(vals)
-        payment.member_id._update_payment_status()
-        return payment
+    @api.model_create_multi
+    def create(self, vals_list):
+        payments = super().create(vals_list)
+        self.env['group.member.installment']._update_states(payments.member_id)
+        return payments
     
     def write(self, vals):
-        """Ödəniş yenilənəndə üzvün ödəniş məlumatlarını yenilə"""
+        members = self.member_id
         res = super().write(vals)
-        for payment in self:
-            payment.member_id._update_payment_status()
+        if any(fname in vals for fname in ('member_id', 'amount', 'is_confirmed')):
+            self.env['group.member.installment']._update_states(members | self.member_id)
         return res
     
     def unlink(self):
-        """Ödəniş silinəndə üzvün ödəniş məlumatlarını yenilə"""
-        members = self.mapped('member_id')
+        members = self.member_id
         res = super().unlink()
-        for member in members:
-            member._update_payment_status()
-        return res
\ No newline at end of file
+        # Ödəniş silindikdə örtülən taksitlər yenidən açılır
+        self.env['group.member.installment']._update_states(members)
+        return res
+    
+    @api.constrains('amount')
+    def _check_amount(self):
+        for payment in self:
+            if payment.amount <= 0:
+                raise ValidationError("Ödəniş məbləği müsbət olmalıdır!")
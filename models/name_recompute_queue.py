@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import models, fields, api, modules
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
+
+
+class NameRecomputeQueue(models.Model):
+    _name = 'edde.name.recompute.queue'
+    _description = 'Ad Yenilənməsi Növbəsi'
+    _order = 'id'
+
+    res_model = fields.Char(string='Model', required=True)
+    res_id = fields.Integer(string='Qeyd ID', required=True)
+    version = fields.Integer(string='Versiya', default=1, required=True,
+                             help='Qeyd hər dəfə yenidən növbəyə düşəndə artır')
+
+    _sql_constraints = [
+        ('res_unique', 'unique(res_model, res_id)', 'Bu qeyd artıq növbədədir!'),
+    ]
+
+    # Adı dəyişən model → [(asılı model, mənbəyə aparan sahə, yenilənən sahələr)]
+    _DEPENDENTS = {
+        'edde.course.registration': [
+            ('course.group.member', 'student_name', ['display_name']),
+            ('course.lesson.attendance', 'student_id.student_name', ['student_name', 'display_name']),
+            ('group.member.payment', 'member_id.student_name', ['student_name', 'display_name']),
+        ],
+        'course.group': [
+            ('course.group.member', 'group_id', ['display_name']),
+            ('course.group.lesson.day', 'group_id', ['display_name']),
+            ('group.member.payment', 'member_id.group_id', ['group_name', 'display_name']),
+        ],
+    }
+
+    @api.model
+    def _is_sync(self):
+        """Sinxron rejim: ``name_recompute_sync`` konteksti, default olaraq testlərdə aktivdir"""
+        return self.env.context.get('name_recompute_sync', bool(modules.module.current_test))
+
+    @api.model
+    def _enqueue(self, records):
+        """Adı dəyişən qeydlərin asılı sahələrini yenilənmə üçün növbəyə qoyur.
+
+        Sinxron rejimdə sahələr dərhal yenilənir. Əks halda qeydlər növbəyə
+        yazılır və cron işə salınır - istifadəçi sorğusu gözləmir.
+        """
+        if not records or records._name not in self._DEPENDENTS:
+            return
+        if self._is_sync():
+            self._recompute_dependents(records._name, records.ids, auto_commit=False)
+            return
+
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO %s AS queue (res_model, res_id, version, create_uid, create_date, write_uid, write_date)
+            SELECT %s, unnest(%s::int[]), 1, %s, %s, %s, %s
+            ON CONFLICT (res_model, res_id) DO UPDATE
+               SET version = queue.version + 1, write_date = EXCLUDED.write_date
+            """,
+            SQL.identifier(self._table), records._name, list(records.ids),
+            self.env.uid, self.env.cr.now(), self.env.uid, self.env.cr.now(),
+        ))
+        cron = self.env.ref(f'{self._module}.ir_cron_name_recompute', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _recompute_dependents(self, res_model, res_ids, batch_size=1000, auto_commit=True):
+        """Mənbə qeydlərdən asılı saxlanılan ad sahələrini hissə-hissə yeniləyir"""
+        for model_name, path, field_names in self._DEPENDENTS[res_model]:
+            Model = self.env[model_name].with_context(active_test=False)
+            fields_to_compute = [Model._fields[fname] for fname in field_names]
+            dependent_ids = Model.search([(path, 'in', res_ids)]).ids
+            for ids in split_every(batch_size, dependent_ids):
+                records = Model.browse(ids)
+                for field in fields_to_compute:
+                    self.env.add_to_compute(field, records)
+                records.flush_recordset(field_names)
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+            if dependent_ids:
+                _logger.info("%s: %s qeydin adları yeniləndi (%s)", model_name, len(dependent_ids), res_model)
+
+    @api.model
+    def _cron_process_queue(self, batch_size=1000, auto_commit=True):
+        """Növbədəki adı dəyişmiş qeydlərin asılılarını yenilə"""
+        for res_model in self._DEPENDENTS:
+            entries = self.search_fetch([('res_model', '=', res_model)], ['res_id', 'version'])
+            if not entries:
+                continue
+            claimed_ids, claimed_versions = entries.ids, entries.mapped('version')
+            self._recompute_dependents(
+                res_model, entries.mapped('res_id'), batch_size=batch_size, auto_commit=auto_commit,
+            )
+            # Yalnız oxunan versiyalar silinir - emal zamanı yenidən növbəyə
+            # düşən qeydlərin versiyası artıb və növbəti işə saxlanılır
+            self.env.cr.execute(SQL(
+                """
+                DELETE FROM %s AS queue
+                 USING unnest(%s::int[], %s::int[]) AS claimed(id, version)
+                 WHERE queue.id = claimed.id AND queue.version = claimed.version
+                """,
+                SQL.identifier(self._table), claimed_ids, claimed_versions,
+            ))
+            self.invalidate_model()
+            if auto_commit:
+                self.env.cr.commit()
@@ -1,3 +1,5 @@
+from dateutil.relativedelta import relativedelta
+
 from odoo import models, fields, api
 
 class Partner(models.Model):
@@ -19,6 +21,15 @@ class Partner(models.Model):
     course_id = fields.Many2many('course.course', string='Kurs')
     source_id = fields.Many2one('course.source', string='Mənbə')
     
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals:
+            # Tələbə adının nüsxələri cron ilə yenilənir. Qeydiyyatlara girişi
+            # olmayan istifadəçi də kontaktın adını dəyişə bilməlidir
+            registrations = self.env['edde.course.registration'].sudo().search([('student_id', 'in', self.ids)])
+            self.env['edde.name.recompute.queue'].sudo()._enqueue(registrations)
+        return res
+    
     # Button action to create a student registration
     def action_create_student(self):
         """
@@ -27,17 +38,7 @@ class Partner(models.Model):
         self.ensure_one()
         
         # Create a new student registration with this contact
-        vals = {
-            'student_id': self.id,
-            'phone': self.phone,
-            'phone2': self.mobile,
-            'email': self.email,
-            'program': self.program_id.id if self.program_id else False,
-            'university': self.university_id.id if self.university_id else False,
-            'course': self.course_id.id if self.course_id else False,
-            'source': self.source_id.id if self.source_id else False,
-            'country': self.student_country_id.id if self.student_country_id else False,
-        }
+        vals = self._prepare_registration_vals()
         
         # Create the registration
         registration = self.env['edde.course.registration'].create(vals)
@@ -52,6 +53,23 @@ class Partner(models.Model):
             'target': 'current',
         }
 
+    def _prepare_registration_vals(self):
+        """
+        Kontaktın məlumatlarından tələbə qeydiyyatı üçün dəyərlər hazırlayır
+        """
+        self.ensure_one()
+        return {
+            'student_id': self.id,
+            'phone': self.phone,
+            'phone2': self.mobile,
+            'email': self.email,
+            'program': self.program_id[:1].id,
+            'university': self.university_id.id,
+            'course': self.course_id[:1].id,
+            'source': self.source_id.id,
+            'country': self.student_country_id.id,
+        }
+
     def action_create_salary(self):
         """
         Müəllim üçün maaş yaratma formu aç
@@ -65,7 +83,8 @@ class Partner(models.Model):
         current_month = fields.Date.today().replace(day=1)
         existing_salary = self.env['teacher.salary'].search([
             ('teacher_id', '=', self.id),
-            ('salary_month', '=', current_month)
+            ('salary_month', '>=', current_month),
+            ('salary_month', '<', current_month + relativedelta(months=1)),
         ], limit=1)
         
         if existing_salary:
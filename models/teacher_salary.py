@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
+import time
+from collections import defaultdict
+
+from dateutil.relativedelta import relativedelta
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from datetime import datetime
+from odoo.tools.sql import create_index
 
 
 class TeacherSalary(models.Model):
@@ -39,6 +44,11 @@ class TeacherSalary(models.Model):
     notes = fields.Text(string='Qeydlər')
     display_name = fields.Char(string='Ad', compute='_compute_display_name', store=True)
 
+    def init(self):
+        # Müəllim + ay üzrə maaş axtarışları
+        create_index(self.env.cr, 'teacher_salary_teacher_month_idx',
+                     self._table, ['teacher_id', 'salary_month'])
+
     @api.depends('teacher_id', 'salary_month')
     def _compute_display_name(self):
         for salary in self:
@@ -50,24 +60,58 @@ class TeacherSalary(models.Model):
 
     @api.depends('teacher_id', 'salary_month')
     def _compute_lesson_count(self):
+        # Maaşları aylara görə qruplaşdır - hər ay üçün bir sorğu
+        salaries_by_month = defaultdict(lambda: self.browse())
         for salary in self:
             if salary.teacher_id and salary.salary_month:
-                # Həmin ayda müəllimin keçdiyi dərsləri say
-                start_date = salary.salary_month.replace(day=1)
-                if salary.salary_month.month == 12:
-                    end_date = salary.salary_month.replace(year=salary.salary_month.year + 1, month=1, day=1)
-                else:
-                    end_date = salary.salary_month.replace(month=salary.salary_month.month + 1, day=1)
-                
-                lesson_days = self.env['course.group.lesson.day'].search([
-                    ('teacher_id', '=', salary.teacher_id.id),
-                    ('lesson_date', '>=', start_date),
-                    ('lesson_date', '<', end_date),
-                    ('status', '=', 'completed')
-                ])
-                salary.lesson_count = len(lesson_days)
+                salaries_by_month[salary.salary_month.replace(day=1)] |= salary
             else:
                 salary.lesson_count = 0
+        
+        for month_start, salaries in salaries_by_month.items():
+            counts = self._get_completed_lesson_counts(month_start, salaries.teacher_id.ids)
+            for salary in salaries:
+                salary.lesson_count = counts.get(salary.teacher_id.id, 0)
+
+    @api.model
+    def _get_completed_lesson_counts(self, month_start, teacher_ids):
+        """Həmin ayda müəllimlərin keçdiyi dərsləri bir qruplaşdırılmış sorğu ilə say"""
+        groups = self.env['course.group.lesson.day']._read_group(
+            [
+                ('teacher_id', 'in', teacher_ids),
+                ('lesson_date', '>=', month_start),
+                ('lesson_date', '<', month_start + relativedelta(months=1)),
+                ('status', '=', 'completed'),
+            ],
+            ['teacher_id'],
+            ['__count'],
+        )
+        return {teacher.id: count for teacher, count in groups}
+
+    @api.model
+    def _mark_lesson_counts_dirty(self, periods):
+        """Dəyişən (müəllim, ay) cütlərinin qaralama maaşlarını yenidən hesablamaq üçün işarələ.
+
+        Hesablama dərhal aparılmır: işarələnmiş maaşlar növbəti flush zamanı
+        (ən gec tranzaksiyanın sonunda) ay üzrə toplu şəkildə yenilənir.
+        """
+        if not periods:
+            return self.browse()
+        
+        months = {month for _teacher_id, month in periods}
+        candidates = self.search([
+            ('teacher_id', 'in', list({teacher_id for teacher_id, _month in periods})),
+            ('salary_month', '>=', min(months)),
+            ('salary_month', '<', max(months) + relativedelta(months=1)),
+            ('status', '=', 'draft'),
+        ])
+        salaries = candidates.filtered(
+            lambda s: (s.teacher_id.id, s.salary_month.replace(day=1)) in periods
+        )
+        if salaries:
+            for fname in ('lesson_count', 'calculated_salary', 'final_salary'):
+                self.env.add_to_compute(self._fields[fname], salaries)
+        return salaries
 
     @api.depends('salary_type', 'fixed_salary', 'lesson_rate', 'lesson_count')
     def _compute_calculated_salary(self):
@@ -87,16 +131,20 @@ class TeacherSalary(models.Model):
     @api.constrains('teacher_id', 'salary_month')
     def _check_unique_month(self):
         """Bir müəllim üçün eyni ayda yalnız bir maaş qeydi ola bilər"""
-        for salary in self:
-            existing = self.search([
-                ('teacher_id', '=', salary.teacher_id.id),
-                ('salary_month', '=', salary.salary_month),
-                ('id', '!=', salary.id)
-            ])
-            if existing:
-                month_year = salary.salary_month.strftime('%m/%Y')
+        checked_pairs = {(salary.teacher_id.id, salary.salary_month) for salary in self}
+        duplicates = self._read_group(
+            [
+                ('teacher_id', 'in', self.teacher_id.ids),
+                ('salary_month', 'in', list({salary.salary_month for salary in self})),
+            ],
+            ['teacher_id', 'salary_month:day'],
+            having=[('__count', '>', 1)],
+        )
+        for teacher, salary_month in duplicates:
+            if (teacher.id, salary_month) in checked_pairs:
+                month_year = salary_month.strftime('%m/%Y')
                 raise ValidationError(
-                    f"{salary.teacher_id.name} üçün {month_year} ayında artıq maaş qeydi mövcuddur!"
+                    f"{teacher.name} üçün {month_year} ayında artıq maaş qeydi mövcuddur!"
                 )
 
     def action_confirm(self):
@@ -113,25 +161,61 @@ class TeacherSalary(models.Model):
 
     @api.model
     def generate_monthly_salaries(self, month_date=None):
-        """Bütün müəllimlər üçün aylıq maaş qeydləri yarat"""
-        if not month_date:
-            month_date = fields.Date.today()
+        """Bütün müəllimlər üçün aylıq maaş qeydlərini toplu yarat.
+
+        Mövcud maaşlar bir sorğu ilə oxunur, çatmayanlar bir ``create`` ilə
+        yaradılır. Hər icra ``teacher.salary.run`` qeydində müddəti və işlənən
+        sətir sayı ilə saxlanılır.
+        """
+        started_at = time.perf_counter()
+        month_date = fields.Date.to_date(month_date) if month_date else fields.Date.today()
+        month_date = month_date.replace(day=1)
         
         teachers = self.env['res.partner'].search([('is_teacher', '=', True)])
-        created_salaries = []
         
-        for teacher in teachers:
-            # Yoxla ki, bu ay üçün artıq maaş qeydi varmı
-            existing = self.search([
-                ('teacher_id', '=', teacher.id),
-                ('salary_month', '=', month_date)
-            ])
-            
-            if not existing:
-                salary = self.create({
-                    'teacher_id': teacher.id,
-                    'salary_month': month_date,
-                })
-                created_salaries.append(salary)
+        # Bu ay üçün artıq maaş qeydi olan müəllimlər - formdan yaradılan
+        # maaşların tarixi ayın istənilən günü ola bilər
+        existing_teacher_ids = {
+            teacher.id
+            for [teacher] in self._read_group(
+                [
+                    ('teacher_id', 'in', teachers.ids),
+                    ('salary_month', '>=', month_date),
+                    ('salary_month', '<', month_date + relativedelta(months=1)),
+                ],
+                ['teacher_id'],
+            )
+        }
         
-        return created_salaries
\ No newline at end of file
+        salaries = self.create([
+            {'teacher_id': teacher_id, 'salary_month': month_date}
+            for teacher_id in teachers.ids
+            if teacher_id not in existing_teacher_ids
+        ])
+        # Dərs sayları və maaşlar icra müddətinə daxil olsun
+        salaries.flush_recordset()
+        
+        self.env['teacher.salary.run'].sudo().create({
+            'salary_month': month_date,
+            'teacher_count': len(teachers),
+            'created_count': len(salaries),
+            'duration': time.perf_counter() - started_at,
+        })
+        return salaries
+
+    @api.model
+    def _cron_generate_monthly_salaries(self):
+        """Aylıq maaş hesablanması üçün planlaşdırılmış tapşırıq"""
+        self.generate_monthly_salaries()
+
+
+class TeacherSalaryRun(models.Model):
+    _name = 'teacher.salary.run'
+    _description = 'Aylıq Maaş Hesablaması'
+    _order = 'run_date desc'
+
+    salary_month = fields.Date(string='Maaş Ayı', required=True, readonly=True)
+    run_date = fields.Datetime(string='İcra Tarixi', default=fields.Datetime.now, readonly=True)
+    teacher_count = fields.Integer(string='Müəllim Sayı', readonly=True)
+    created_count = fields.Integer(string='Yaradılan Maaşlar', readonly=True)
+    duration = fields.Float(string='Müddət (san.)', digits=(16, 3), readonly=True)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Performans testləri üçün real həcmə yaxın məlumat generatoru.
+
+Odoo 18-də ``odoo-bin populate`` mövcud qeydləri çoxaldır (``--models``,
+``--factors``) və köhnə ``_populate_factories`` API-ni işə salmır. Bu
+generator isə məlumatı modulun öz toplu axınları ilə yaradır: dərs günləri
+qrup qrafikindən, devamiyyət dərs günləri ilə birlikdə, maaşlar aylıq
+hesablama ilə. İstifadə::
+
+    odoo-bin shell -d <baza>
+    >>> from odoo.addons.<modul>.populate import populate
+    >>> populate(env, 'large')
+    >>> env.cr.commit()
+"""
+import logging
+import random as random_module
+
+from .course_config import populate_catalog
+from .course_group import populate_groups, populate_lesson_days, populate_teachers
+from .course_group_member import populate_members
+from .course_lesson_attendance import populate_absences
+from .course_registration import populate_registrations
+from .group_member_payment import populate_payments
+from .teacher_salary import populate_salaries
+
+_logger = logging.getLogger(__name__)
+
+SIZES = {
+    'small': {
+        'programs': 3, 'courses': 5, 'teachers': 5, 'registrations': 100,
+        'groups': 10, 'members': 50, 'payments': 100, 'salary_months': 2,
+    },
+    'medium': {
+        'programs': 10, 'courses': 30, 'teachers': 20, 'registrations': 2000,
+        'groups': 100, 'members': 1500, 'payments': 3000, 'salary_months': 6,
+    },
+    'large': {
+        'programs': 20, 'courses': 60, 'teachers': 60, 'registrations': 10000,
+        'groups': 400, 'members': 8000, 'payments': 15000, 'salary_months': 12,
+    },
+}
+
+
+def populate(env, size='small', seed='edde'):
+    """Verilən ölçüdə (small, medium, large) bütün EDDE məlumatını yaradır.
+
+    Commit edilmir - çağıran tərəf qərar verir. ``seed`` eyni olduqda
+    eyni məlumat yaranır. Large ölçü 100 mindən çox devamiyyət sətri verir.
+    """
+    sizes = SIZES[size]
+    random = random_module.Random(seed)
+    env = env(context=dict(env.context, tracking_disable=True, mail_create_nolog=True,
+                           mail_create_nosubscribe=True, mail_notrack=True))
+
+    programs, courses = populate_catalog(env, sizes)
+    teachers = populate_teachers(env, sizes)
+    registrations = populate_registrations(env, sizes, random, programs, courses)
+    groups = populate_groups(env, sizes, random, programs, courses, teachers)
+    # Üzvlər dərs günlərindən əvvəl yaradılır ki, devamiyyət dərslərlə birlikdə yaransın
+    members = populate_members(env, sizes, random, groups, registrations)
+    lesson_days = populate_lesson_days(env, random, groups)
+    populate_absences(env, random, lesson_days)
+    payments = populate_payments(env, sizes, random, members)
+    salaries = populate_salaries(env, sizes)
+    env.flush_all()
+
+    _logger.info(
+        "EDDE populate (%s): %s qeydiyyat, %s qrup, %s üzv, %s dərs günü, %s devamiyyət, %s ödəniş, %s maaş",
+        size, len(registrations), len(groups), len(members), len(lesson_days),
+        env['course.lesson.attendance'].search_count([('lesson_day_id', 'in', lesson_days.ids)]),
+        len(payments), len(salaries),
+    )
+    return {
+        'registrations': registrations, 'groups': groups, 'members': members,
+        'lesson_days': lesson_days, 'payments': payments, 'salaries': salaries,
+    }
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+
+def populate_catalog(env, sizes):
+    """Proqram və kurs kataloqları"""
+    programs = env['course.program'].create([
+        {'name': f'Program {index}'} for index in range(sizes['programs'])
+    ])
+    courses = env['course.course'].create([
+        {'name': f'Kurs {index}', 'program_id': programs[index % len(programs)].id}
+        for index in range(sizes['courses'])
+    ])
+    return programs, courses
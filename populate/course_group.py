@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+
+
+def populate_teachers(env, sizes):
+    """Qruplara təyin olunan müəllimlər"""
+    return env['res.partner'].create([{
+        'name': f'Müəllim {index}',
+        'is_teacher': True,
+        'salary_type': 'percentage',
+        'lesson_rate': 15.0,
+    } for index in range(sizes['teachers'])])
+
+
+def populate_groups(env, sizes, random, programs, courses, teachers):
+    """Həftədə 2-3 dərsi olan qruplar, son yarım ildə başlayan"""
+    today = fields.Date.today()
+    vals_list = []
+    for index in range(sizes['groups']):
+        start_time = random.choice([9.0, 11.0, 14.0, 16.0, 18.0, 19.5])
+        days = random.sample(['0', '1', '2', '3', '4', '5', '6'], random.choice([2, 3]))
+        vals_list.append({
+            'name': f'Qrup {index}',
+            'program_id': [(6, 0, [random.choice(programs.ids)])],
+            'course_id': [(6, 0, [random.choice(courses.ids)])],
+            'teacher_id': random.choice(teachers.ids),
+            'number_of_weeks': random.choice([8, 12, 16, 24]),
+            'start_date': today - timedelta(days=random.randint(0, 180)),
+            'is_active': random.random() < 0.9,
+            'schedule_ids': [
+                (0, 0, {'day_of_week': day, 'start_time': start_time, 'end_time': start_time + 1.5})
+                for day in sorted(days)
+            ],
+        })
+    return env['course.group'].create(vals_list)
+
+
+def populate_lesson_days(env, random, groups):
+    """Dərs günlərini qrupların qrafikindən yarat; keçmiş dərsləri keçirilmiş et"""
+    lesson_days = groups.generate_lesson_days()
+
+    today = fields.Date.today()
+    past_lessons = lesson_days.filtered(lambda l: l.lesson_date < today)
+    cancelled = past_lessons.filtered(lambda l: random.random() < 0.05)
+    (past_lessons - cancelled).write({'status': 'completed'})
+    cancelled.write({'status': 'cancelled'})
+    return lesson_days
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+
+def populate_members(env, sizes, random, groups, registrations):
+    """Qrup üzvlükləri; (tələbə, qrup) cütü sayğacdan alınır ki, aktiv üzvlük təkrarlanmasın"""
+    vals_list = []
+    for counter in range(sizes['members']):
+        group = groups[counter % len(groups)]
+        registration = registrations[(counter // len(groups)) % len(registrations)]
+        vals_list.append({
+            'group_id': group.id,
+            'student_name': registration.id,
+            'join_date': group.start_date + timedelta(days=random.randint(0, 21)),
+            'status': random.choices(['active', 'inactive', 'completed', 'suspended'], [17, 1, 1, 1])[0],
+            'payment_plan': random.choices(['full', 'partial', 'installment'], [5, 2, 3])[0],
+            'total_amount': random.choice([300.0, 450.0, 600.0, 900.0]),
+            'initial_payment': random.choice([0.0, 100.0, 150.0]),
+            'installment_count': random.choice([1, 3, 6]),
+        })
+    return env['course.group.member'].create(vals_list)
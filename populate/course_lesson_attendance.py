@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+
+def populate_absences(env, random, lesson_days):
+    """Devamiyyət dərs günləri ilə birlikdə (üzvün qoşulma tarixindən sonra)
+    yaradılır; burada keçirilmiş dərslərin bir hissəsi qeyb kimi işarələnir"""
+    attendances = env['course.lesson.attendance'].search([
+        ('lesson_day_id', 'in', lesson_days.ids),
+        ('lesson_status', '=', 'completed'),
+    ])
+    absent = attendances.filtered(lambda a: random.random() < 0.15)
+    absent.write({'is_present': False})
+    return absent
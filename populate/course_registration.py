@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from odoo.tools import split_every
+
+
+def populate_registrations(env, sizes, random, programs, courses, batch_size=1000):
+    """Tələbə kontaktları və qeydiyyatlar, hissə-hissə yaradılır"""
+    Registration = env['edde.course.registration']
+    statuses = random.choices(
+        ['draft', 'pending', 'confirmed', 'in_progress', 'completed', 'cancelled'],
+        [1, 1, 4, 6, 2, 1], k=sizes['registrations'],
+    )
+    registrations = Registration
+    for indexes in split_every(batch_size, range(sizes['registrations'])):
+        partners = env['res.partner'].create([
+            {'name': f'Tələbə {index}', 'email': f'telebe{index}@example.com'} for index in indexes
+        ])
+        registrations |= Registration.create([{
+            'student_id': partner.id,
+            'status': statuses[index],
+            'gender': random.choice(['male', 'female', False]),
+            'phone': f'+99450{index:07d}',
+            'program': random.choice(programs.ids),
+            'course': random.choice(courses.ids),
+        } for index, partner in zip(indexes, partners)])
+    return registrations
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+
+def populate_payments(env, sizes, random, members):
+    """Ödənişlər üzvün qrupa qoşulmasından sonrakı 60 gün ərzində edilir"""
+    vals_list = []
+    for _index in range(sizes['payments']):
+        member = random.choice(members)
+        vals_list.append({
+            'member_id': member.id,
+            'amount': random.choice([50.0, 100.0, 150.0, 300.0]),
+            'payment_date': member.join_date + timedelta(days=random.randint(0, 60)),
+            'payment_type': random.choice(['initial', 'installment', 'remainder', 'full']),
+            'payment_method': random.choice(['cash', 'bank_transfer', 'card', 'online']),
+            'is_confirmed': random.random() < 0.95,
+        })
+    return env['group.member.payment'].create(vals_list)
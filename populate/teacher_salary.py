@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields
+
+
+def populate_salaries(env, sizes):
+    """Son aylar üçün aylıq maaş hesablamasını işə sal"""
+    Salary = env['teacher.salary']
+    current_month = fields.Date.today().replace(day=1)
+    salaries = Salary
+    for offset in range(sizes['salary_months']):
+        salaries |= Salary.generate_monthly_salaries(current_month - relativedelta(months=offset))
+    return salaries
@@ -0,0 +1,2 @@
+from . import course_attendance_report
+from . import course_receivable_aging
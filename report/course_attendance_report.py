@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+
+
+class CourseAttendanceReport(models.Model):
+    _name = 'course.attendance.report'
+    _description = 'Devamiyyət Hesabatı'
+    _auto = False
+    _rec_name = 'registration_id'
+    _order = 'month desc, group_id'
+
+    registration_id = fields.Many2one('edde.course.registration', string='Tələbə', readonly=True)
+    member_id = fields.Many2one('course.group.member', string='Qrup Üzvü', readonly=True)
+    group_id = fields.Many2one('course.group', string='Qrup', readonly=True)
+    teacher_id = fields.Many2one('res.partner', string='Müəllim', readonly=True)
+    month = fields.Date(string='Ay', readonly=True)
+    lesson_status = fields.Selection([
+        ('scheduled', 'Planlaşdırılıb'),
+        ('completed', 'Keçirilib'),
+        ('cancelled', 'Ləğv edilib')
+    ], string='Dərs Statusu', readonly=True)
+    lesson_count = fields.Integer(string='Dərs Sayı', readonly=True)
+    present_count = fields.Integer(string='İştirak Sayı', readonly=True)
+    absent_count = fields.Integer(string='Qeyb Sayı', readonly=True)
+
+    def init(self):
+        """Tələbə, qrup, müəllim və ay üzrə əvvəlcədən toplanmış materialized view yarat"""
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(SQL(
+            """
+            CREATE MATERIALIZED VIEW %(table)s AS (
+                SELECT row_number() OVER (
+                           ORDER BY m.student_name, m.id, l.group_id, l.teacher_id,
+                                    date_trunc('month', l.lesson_date), l.status
+                       ) AS id,
+                       m.student_name AS registration_id,
+                       m.id AS member_id,
+                       l.group_id AS group_id,
+                       l.teacher_id AS teacher_id,
+                       date_trunc('month', l.lesson_date)::date AS month,
+                       l.status AS lesson_status,
+                       COUNT(*) AS lesson_count,
+                       COUNT(*) FILTER (WHERE a.is_present) AS present_count,
+                       COUNT(*) FILTER (WHERE NOT COALESCE(a.is_present, FALSE)) AS absent_count
+                  FROM course_lesson_attendance a
+                  JOIN course_group_lesson_day l ON l.id = a.lesson_day_id
+                  JOIN course_group_member m ON m.id = a.student_id
+              GROUP BY m.student_name, m.id, l.group_id, l.teacher_id,
+                       date_trunc('month', l.lesson_date), l.status
+            )
+            """,
+            table=SQL.identifier(self._table),
+        ))
+        # CONCURRENTLY yeniləmə üçün unikal indeks tələb olunur
+        self.env.cr.execute(SQL(
+            "CREATE UNIQUE INDEX %s ON %s (id)",
+            SQL.identifier(f'{self._table}_id_uniq'), SQL.identifier(self._table),
+        ))
+        self.env.cr.execute(SQL(
+            "CREATE INDEX %s ON %s (teacher_id, month)",
+            SQL.identifier(f'{self._table}_teacher_month_idx'), SQL.identifier(self._table),
+        ))
+        self.env.cr.execute(SQL(
+            "CREATE INDEX %s ON %s (registration_id, month)",
+            SQL.identifier(f'{self._table}_registration_month_idx'), SQL.identifier(self._table),
+        ))
+
+    @api.model
+    def refresh_view(self):
+        """Materialized view-u yenilə - oxuyanları bloklamadan"""
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY %s", SQL.identifier(self._table),
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh_view(self):
+        """Devamiyyət hesabatını yeniləmək üçün planlaşdırılmış tapşırıq"""
+        self.refresh_view()
+
+    @api.model
+    def action_refresh_view(self):
+        """Hesabatı yenilə və görünüşü yenidən yüklə"""
+        self.refresh_view()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'reload',
+        }
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+
+class CourseReceivableAging(models.Model):
+    _name = 'course.receivable.aging'
+    _description = 'Debitor Borcların Yaşlanması'
+    _rec_name = 'member_id'
+    _order = 'days_outstanding desc'
+
+    snapshot_date = fields.Date(string='Hesabat Tarixi', readonly=True)
+    member_id = fields.Many2one('course.group.member', string='Qrup Üzvü', readonly=True, ondelete='cascade')
+    registration_id = fields.Many2one('edde.course.registration', string='Tələbə', readonly=True)
+    group_id = fields.Many2one('course.group', string='Qrup', readonly=True)
+    reference_date = fields.Date(string='Son Ödəniş / Başlama', readonly=True,
+                                 help='Son təsdiqlənmiş ödəniş tarixi, ödəniş yoxdursa başlama tarixi')
+    days_outstanding = fields.Integer(string='Gün', readonly=True, aggregator='max')
+    aging_bucket = fields.Selection([
+        ('0_30', '0-30 gün'),
+        ('31_60', '31-60 gün'),
+        ('61_90', '61-90 gün'),
+        ('90_plus', '90+ gün'),
+    ], string='Müddət', readonly=True)
+    remaining_amount = fields.Float(string='Qalıq Borc', readonly=True)
+    amount_0_30 = fields.Float(string='0-30 gün', readonly=True)
+    amount_31_60 = fields.Float(string='31-60 gün', readonly=True)
+    amount_61_90 = fields.Float(string='61-90 gün', readonly=True)
+    amount_90_plus = fields.Float(string='90+ gün', readonly=True)
+
+    @api.model
+    def generate_snapshot(self, snapshot_date=None):
+        """Qalıq borcların yaşlanma hesabatını bir SQL sorğusu ilə yenidən qurur.
+
+        Cədvəldə yalnız son hesabat saxlanılır. Borcun yaşı son təsdiqlənmiş
+        ödənişdən, ödəniş yoxdursa üzvün başlama tarixindən hesablanır.
+        """
+        snapshot_date = snapshot_date or fields.Date.context_today(self)
+        self.env['course.group.member'].flush_model(
+            ['student_name', 'group_id', 'join_date', 'remaining_amount']
+        )
+        self.env['group.member.payment'].flush_model(['member_id', 'payment_date', 'is_confirmed'])
+
+        self.env.cr.execute(SQL("DELETE FROM %s", SQL.identifier(self._table)))
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO %(table)s (
+                snapshot_date, member_id, registration_id, group_id, reference_date,
+                days_outstanding, aging_bucket, remaining_amount,
+                amount_0_30, amount_31_60, amount_61_90, amount_90_plus,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT %(date)s, aged.member_id, aged.registration_id, aged.group_id, aged.reference_date,
+                   aged.days,
+                   CASE WHEN aged.days <= 30 THEN '0_30'
+                        WHEN aged.days <= 60 THEN '31_60'
+                        WHEN aged.days <= 90 THEN '61_90'
+                        ELSE '90_plus' END,
+                   aged.remaining_amount,
+                   CASE WHEN aged.days <= 30 THEN aged.remaining_amount ELSE 0 END,
+                   CASE WHEN aged.days BETWEEN 31 AND 60 THEN aged.remaining_amount ELSE 0 END,
+                   CASE WHEN aged.days BETWEEN 61 AND 90 THEN aged.remaining_amount ELSE 0 END,
+                   CASE WHEN aged.days > 90 THEN aged.remaining_amount ELSE 0 END,
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM (
+                    SELECT member.id AS member_id,
+                           member.student_name AS registration_id,
+                           member.group_id AS group_id,
+                           member.remaining_amount AS remaining_amount,
+                           GREATEST(MAX(payment.payment_date), member.join_date) AS reference_date,
+                           GREATEST(%(date)s - GREATEST(MAX(payment.payment_date), member.join_date), 0) AS days
+                      FROM %(member_table)s member
+                 LEFT JOIN %(payment_table)s payment
+                        ON payment.member_id = member.id AND payment.is_confirmed
+                     WHERE member.remaining_amount > 0
+                  GROUP BY member.id
+                   ) aged
+            """,
+            table=SQL.identifier(self._table),
+            member_table=SQL.identifier(self.env['course.group.member']._table),
+            payment_table=SQL.identifier(self.env['group.member.payment']._table),
+            date=snapshot_date,
+            uid=self.env.uid,
+            now=self.env.cr.now(),
+        ))
+        self.invalidate_model()
+        return self.env.cr.rowcount
+
+    @api.model
+    def _cron_generate_snapshot(self):
+        """Gündəlik borc yaşlanması hesabatı"""
+        self.generate_snapshot()
+
+    @api.model
+    def action_generate_snapshot(self):
+        """Hesabatı yenilə və görünüşü yenidən yüklə"""
+        self.generate_snapshot()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'reload',
+        }
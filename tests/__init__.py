@@ -0,0 +1,11 @@
+from . import test_debt_reminders
+from . import test_installments
+from . import test_name_recompute
+from . import test_performance
+from . import test_populate
+from . import test_query_plans
+from . import test_receivable_aging
+from . import test_registration_import
+from . import test_rooms
+from . import test_teacher_salary
+from . import test_teacher_conflicts
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from datetime import date
+
+from odoo.tests.common import TransactionCase
+
+_logger = logging.getLogger(__name__)
+
+# Sorğu sayının məlumat həcmindən asılı olmadan sabit qalmalı olduğu
+# axınlarda ölçülər arasında icazə verilən maksimal fərq
+QUERY_SLACK = 3
+
+
+class EddeCourseCommon(TransactionCase):
+    """Testlər üçün ümumi məlumat yaradıcıları"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.program = cls.env['course.program'].create({'name': 'Test Program'})
+        cls.course = cls.env['course.course'].create({
+            'name': 'Test Kurs',
+            'program_id': cls.program.id,
+        })
+
+    @classmethod
+    def _create_teachers(cls, count):
+        return cls.env['res.partner'].create([{
+            'name': f'Müəllim {index}',
+            'is_teacher': True,
+            'salary_type': 'percentage',
+            'lesson_rate': 10.0,
+        } for index in range(count)])
+
+    @classmethod
+    def _create_registrations(cls, count, prefix='Tələbə'):
+        partners = cls.env['res.partner'].create([
+            {'name': f'{prefix} {index}', 'email': f'{prefix.lower()}{index}@example.com'}
+            for index in range(count)
+        ])
+        return cls.env['edde.course.registration'].create([
+            {'student_id': partner.id, 'status': 'confirmed'} for partner in partners
+        ])
+
+    @classmethod
+    def _create_groups(cls, count, teachers, number_of_weeks=4, start_date=date(2025, 1, 6)):
+        """Bazar ertəsi, çərşənbə və cümə dərsləri olan qruplar yaradır"""
+        return cls.env['course.group'].create([{
+            'name': f'Qrup {index}',
+            'program_id': [(6, 0, cls.program.ids)],
+            'course_id': [(6, 0, cls.course.ids)],
+            'teacher_id': teachers[index % len(teachers)].id,
+            'start_date': start_date,
+            'number_of_weeks': number_of_weeks,
+            'schedule_ids': [
+                (0, 0, {'day_of_week': day, 'start_time': 18.0 + index % 3, 'end_time': 19.0 + index % 3})
+                for day in ('0', '2', '4')
+            ],
+        } for index in range(count)])
+
+    @classmethod
+    def _enroll(cls, groups, registrations, per_group, join_date=date(2025, 1, 6)):
+        """Hər qrupa ``per_group`` tələbə əlavə edir"""
+        vals_list = []
+        for group_index, group in enumerate(groups):
+            for offset in range(per_group):
+                registration = registrations[(group_index + offset) % len(registrations)]
+                vals_list.append({
+                    'group_id': group.id,
+                    'student_name': registration.id,
+                    'join_date': join_date,
+                    'total_amount': 300.0,
+                })
+        return cls.env['course.group.member'].create(vals_list)
+
+    def _measure(self, label, size, budget, func):
+        """``func``-u sorğu büdcəsi daxilində icra edir, (sorğu sayı, nəticə) qaytarır"""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        count_before = self.env.cr.sql_log_count
+        started_at = time.perf_counter()
+        with self.assertQueryCount(budget):
+            result = func()
+        elapsed = time.perf_counter() - started_at
+        queries = self.env.cr.sql_log_count - count_before
+        _logger.info("%s [ölçü=%s]: %s sorğu, %.3f san.", label, size, queries, elapsed)
+        return queries, result
+
+    def assertQueriesScale(self, label, budget, sizes, scenario):
+        """Axını bir neçə məlumat həcmində büdcə daxilində icra edir və sorğu
+        sayının həcmlə artmadığını yoxlayır.
+
+        ``scenario(size)`` məlumatı hazırlayır və ``(flow, check)`` qaytarır:
+        ``flow`` ölçülən çağırışdır, ``check(result)`` isə onun nəticəsini
+        yoxlayır (``None`` ola bilər).
+        """
+        counts = {}
+        for size in sizes:
+            with self.subTest(size=size):
+                flow, check = scenario(size)
+                counts[size], result = self._measure(label, size, budget, flow)
+                if check:
+                    check(result)
+        self.assertLessEqual(
+            max(counts.values()) - min(counts.values()), QUERY_SLACK,
+            f"{label}: sorğu sayı məlumat həcmi ilə artır {counts}",
+        )
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestDebtReminders(EddeCourseCommon):
+    """Borc xatırlatmalarının toplu növbəyə qoyulması"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(1)
+        cls.group = cls._create_groups(1, cls.teachers)
+        cls.debtors = cls._create_registrations(5, prefix='Borclu')
+        cls.paid = cls._create_registrations(1, prefix='Ödəyən')
+        cls.not_due = cls._create_registrations(1, prefix='Vaxtı')
+
+        # Başlama tarixi keçmişdədir - yeganə taksit gecikib
+        cls._enroll(cls.group, cls.debtors + cls.paid, per_group=6)
+        member = cls.paid.group_memberships
+        cls.env['group.member.payment'].create({'member_id': member.id, 'amount': member.total_amount})
+
+        # Taksiti hələ vaxtı çatmayıb
+        cls._enroll(cls.group, cls.not_due, per_group=1,
+                    join_date=fields.Date.today() + timedelta(days=10))
+
+    def _reminder_mails(self, registrations):
+        return self.env['mail.mail'].search([
+            ('model', '=', 'edde.course.registration'),
+            ('res_id', 'in', registrations.ids),
+        ])
+
+    def test_select_debtors(self):
+        Registration = self.env['edde.course.registration']
+        self.assertEqual(sorted(Registration._get_debt_reminder_ids()), sorted(self.debtors.ids))
+
+    def test_send_reminders_in_chunks(self):
+        Registration = self.env['edde.course.registration']
+        sent = Registration._send_debt_reminders(chunk_size=2, auto_commit=False)
+        self.assertEqual(sent, len(self.debtors))
+
+        mails = self._reminder_mails(self.debtors | self.paid | self.not_due)
+        self.assertEqual(sorted(mails.mapped('res_id')), sorted(self.debtors.ids))
+        self.assertEqual(mails.recipient_ids, self.debtors.student_id)
+        self.assertIn(self.group.name, mails[0].body_html)
+        self.assertEqual(set(self.debtors.mapped('last_debt_reminder_date')), {fields.Date.today()})
+        self.assertFalse(self.paid.last_debt_reminder_date)
+
+        # Təkrar işə salınmada artıq xatırladılanlar seçilmir
+        self.assertEqual(Registration._send_debt_reminders(chunk_size=2, auto_commit=False), 0)
+        self.assertEqual(len(self._reminder_mails(self.debtors)), len(self.debtors))
+
+    def test_reminder_interval(self):
+        Registration = self.env['edde.course.registration']
+        self.debtors[:2].last_debt_reminder_date = fields.Date.today() - timedelta(days=3)
+        self.debtors[2:4].last_debt_reminder_date = fields.Date.today() - timedelta(days=8)
+        self.assertEqual(
+            sorted(Registration._get_debt_reminder_ids(interval_days=7)),
+            sorted(self.debtors[2:].ids),
+        )
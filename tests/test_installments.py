@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestInstallments(EddeCourseCommon):
+    """Taksit qrafikinin yaradılması və gecikmə statusunun yenilənməsi"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(1)
+        cls.registrations = cls._create_registrations(3)
+        cls.group = cls._create_groups(1, cls.teachers)
+
+    def _create_member(self, registration, **vals):
+        return self.env['course.group.member'].create(dict({
+            'group_id': self.group.id,
+            'student_name': registration.id,
+            'join_date': date(2025, 1, 10),
+            'total_amount': 1000.0,
+        }, **vals))
+
+    def _update_states(self, today, members=None):
+        with patch.object(fields.Date, 'context_today', lambda *args, **kwargs: today):
+            return self.env['group.member.installment']._update_states(members)
+
+    def test_installment_plan(self):
+        member = self._create_member(
+            self.registrations[0], payment_plan='installment', initial_payment=100.0, installment_count=3,
+        )
+        installments = member.installment_ids.sorted('sequence')
+        self.assertEqual(installments.mapped('amount'), [100.0, 300.0, 300.0, 300.0])
+        self.assertEqual(installments.mapped('due_date'), [
+            date(2025, 1, 10), date(2025, 2, 10), date(2025, 3, 10), date(2025, 4, 10),
+        ])
+
+        # Yuvarlaqlaşdırma fərqi son taksitə düşür
+        member.write({'initial_payment': 0.0, 'total_amount': 100.0})
+        self.assertEqual(member.installment_ids.sorted('sequence').mapped('amount'), [33.33, 33.33, 33.34])
+
+    def test_full_partial_and_custom_plans(self):
+        full = self._create_member(self.registrations[0])
+        self.assertEqual(full.installment_ids.mapped('amount'), [1000.0])
+
+        partial = self._create_member(self.registrations[1], payment_plan='partial', initial_payment=400.0)
+        self.assertEqual(partial.installment_ids.sorted('sequence').mapped('amount'), [400.0, 600.0])
+
+        custom = self._create_member(self.registrations[2], payment_plan='custom')
+        self.assertFalse(custom.installment_ids)
+
+    def test_overdue_and_paid_states(self):
+        member = self._create_member(
+            self.registrations[0], payment_plan='installment', initial_payment=100.0, installment_count=3,
+        )
+        installments = member.installment_ids.sorted('sequence')
+
+        self._update_states(date(2025, 2, 15))
+        self.assertEqual(installments.mapped('state'), ['overdue', 'overdue', 'planned', 'planned'])
+
+        # Ödəniş taksitləri tarix ardıcıllığı ilə örtür, qismən ödənilən taksit açıq qalır
+        self.env['group.member.payment'].create({
+            'member_id': member.id, 'amount': 250.0, 'payment_date': date(2025, 2, 15),
+        })
+        self._update_states(date(2025, 2, 15))
+        self.assertEqual(installments.mapped('state'), ['paid', 'overdue', 'planned', 'planned'])
+        self.assertEqual(installments.mapped('residual_amount'), [0.0, 150.0, 300.0, 300.0])
+
+        # Dəyişiklik olmadıqda heç bir sətir yazılmır
+        self.assertFalse(self._update_states(date(2025, 2, 15)))
+
+        # Təsdiqlənməmiş ödəniş nəzərə alınmır
+        payment = member.payment_ids
+        payment.is_confirmed = False
+        self._update_states(date(2025, 2, 15))
+        self.assertEqual(installments[0].state, 'overdue')
+
+        payment.unlink()
+        self.env['group.member.payment'].create({
+            'member_id': member.id, 'amount': 1000.0, 'payment_date': date(2025, 2, 20),
+        })
+        self.assertEqual(set(installments.mapped('state')), {'paid'})
+
+    def test_update_states_query_count(self):
+        def scenario(size):
+            registrations = self._create_registrations(size, prefix=f'Taksit{size}')
+            members = self.env['course.group.member'].create([{
+                'group_id': self.group.id,
+                'student_name': registration.id,
+                'join_date': date(2025, 1, 10),
+                'total_amount': 600.0,
+                'payment_plan': 'installment',
+                'installment_count': 6,
+            } for registration in registrations])
+
+            def check(result):
+                self.assertEqual(
+                    self.env['group.member.installment'].search_count([
+                        ('member_id', 'in', members.ids), ('state', '=', 'overdue'),
+                    ]),
+                    size * 5,
+                )
+            return lambda: self._update_states(date(2025, 6, 1)), check
+
+        self.assertQueriesScale('group.member.installment._update_states', 10, (5, 20), scenario)
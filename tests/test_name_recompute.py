@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from unittest.mock import patch
+
+from odoo.tests import new_test_user, tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestNameRecompute(EddeCourseCommon):
+    """Ad dəyişikliklərinin asılı sahələrə gecikmiş yayılması"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(1)
+        cls.registrations = cls._create_registrations(3)
+        cls.group = cls._create_groups(1, cls.teachers)
+        cls.members = cls._enroll(cls.group, cls.registrations, per_group=3)
+        cls.group.generate_lesson_days()
+        cls.payments = cls.env['group.member.payment'].create([
+            {'member_id': member.id, 'amount': 100.0} for member in cls.members
+        ])
+        cls.Queue = cls.env['edde.name.recompute.queue']
+
+    def test_sync_mode_in_tests(self):
+        self.group.name = 'Yeni Qrup Adı'
+        self.assertEqual(set(self.payments.mapped('group_name')), {'Yeni Qrup Adı'})
+        self.assertTrue(all(name.startswith('Yeni Qrup Adı') for name in self.group.lesson_day_ids.mapped('display_name')))
+        self.assertFalse(self.Queue.search([]))
+
+    def test_deferred_group_rename(self):
+        group = self.group.with_context(name_recompute_sync=False)
+        group.name = 'Gecikmiş Ad'
+        self.env.flush_all()
+        self.assertNotIn('Gecikmiş Ad', self.payments.mapped('group_name'))
+        self.assertEqual(self.Queue.search([]).mapped('res_id'), self.group.ids)
+
+        self.Queue._cron_process_queue(batch_size=5, auto_commit=False)
+        self.assertEqual(set(self.payments.mapped('group_name')), {'Gecikmiş Ad'})
+        self.assertTrue(all('Gecikmiş Ad' in name for name in self.members.mapped('display_name')))
+        self.assertFalse(self.Queue.search([]))
+
+    def test_deferred_student_rename(self):
+        partner = self.registrations[0].student_id.with_context(name_recompute_sync=False)
+        partner.name = 'Yeni Tələbə'
+        self.env.flush_all()
+        member = self.members.filtered(lambda m: m.student_name == self.registrations[0])
+        attendances = self.env['course.lesson.attendance'].search([('student_id', '=', member.id)])
+        self.assertTrue(attendances)
+        self.assertNotIn('Yeni Tələbə', attendances[0].student_name)
+
+        self.Queue._cron_process_queue(auto_commit=False)
+        self.assertTrue(all('Yeni Tələbə' in name for name in attendances.mapped('student_name')))
+        self.assertTrue(all('Yeni Tələbə' in name for name in attendances.mapped('display_name')))
+        self.assertIn('Yeni Tələbə', member.payment_ids.student_name)
+
+    def test_requeue_during_processing_survives(self):
+        group = self.group.with_context(name_recompute_sync=False)
+        group.name = 'Birinci Ad'
+        self.env.flush_all()
+        Queue = type(self.Queue)
+        recompute = Queue._recompute_dependents
+
+        def rename_while_processing(queue, res_model, res_ids, **kwargs):
+            recompute(queue, res_model, res_ids, **kwargs)
+            # Cron işləyərkən qrup yenidən adlandırılır
+            group.name = 'İkinci Ad'
+            self.env.flush_all()
+
+        with patch.object(Queue, '_recompute_dependents', rename_while_processing):
+            self.Queue._cron_process_queue(auto_commit=False)
+        entry = self.Queue.search([])
+        self.assertEqual(entry.res_id, self.group.id)
+        self.assertEqual(entry.version, 2)
+
+        self.Queue._cron_process_queue(auto_commit=False)
+        self.assertEqual(set(self.payments.mapped('group_name')), {'İkinci Ad'})
+        self.assertFalse(self.Queue.search([]))
+
+    def test_rename_partner_without_registration_access(self):
+        user = new_test_user(self.env, login='edde_contact_user', groups='base.group_user,base.group_partner_manager')
+        partner = self.registrations[0].student_id.with_user(user)
+        partner.name = 'Kontakt Adı'
+        self.env.flush_all()
+        member = self.members.filtered(lambda m: m.student_name == self.registrations[0])
+        self.assertIn('Kontakt Adı', member.payment_ids.student_name)
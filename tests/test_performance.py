@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+import io
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install', 'edde_performance')
+class TestPerformance(EddeCourseCommon):
+    """Əsas axınlar üçün sorğu sayı büdcələri.
+
+    Hər test bir neçə məlumat həcmində işləyir: büdcə N+1 reqressiyalarının
+    qarşısını alır, ölçülər arasındakı müqayisə isə sorğu sayının həcmlə
+    artmadığını yoxlayır. İcra müddəti loga yazılır.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(3)
+        cls.registrations = cls._create_registrations(60)
+
+    def test_generate_lesson_days(self):
+        def scenario(size):
+            groups = self._create_groups(size, self.teachers)
+            self._enroll(groups, self.registrations, per_group=5)
+
+            def check(result):
+                self.assertEqual(len(groups.lesson_day_ids), size * 13)
+            return groups.generate_lesson_days, check
+
+        self.assertQueriesScale('generate_lesson_days', 120, (2, 5, 10), scenario)
+
+    def test_member_create(self):
+        def scenario(size):
+            group = self._create_groups(1, self.teachers)
+            group.generate_lesson_days()
+            vals_list = [{
+                'group_id': group.id,
+                'student_name': registration.id,
+                'join_date': date(2025, 1, 6),
+                'total_amount': 300.0,
+                'status': 'inactive',
+            } for registration in self.registrations[:size]]
+
+            def check(members):
+                self.assertEqual(len(members), size)
+                self.assertEqual(len(members.installment_ids), size)
+                # Qeyri-aktiv üzvlük həftəlik qrafikə düşmür
+                self.assertFalse(members.student_name.schedule_ids.filtered(
+                    lambda row: row.group_schedule_id.group_id == group
+                ))
+            return lambda: self.env['course.group.member'].create(vals_list), check
+
+        self.assertQueriesScale('course.group.member.create', 60, (5, 20, 50), scenario)
+
+    def test_member_activation(self):
+        def scenario(size):
+            group = self._create_groups(1, self.teachers)
+            group.generate_lesson_days()
+            members = self.env['course.group.member'].create([{
+                'group_id': group.id,
+                'student_name': registration.id,
+                'join_date': date(2025, 1, 6),
+                'total_amount': 300.0,
+                'status': 'inactive',
+            } for registration in self.registrations[:size]])
+
+            def check(result):
+                self.assertEqual(
+                    self.env['course.lesson.attendance'].search_count([('student_id', 'in', members.ids)]),
+                    size * 13,
+                )
+                self.assertTrue(all(group in registration.active_groups
+                                    for registration in members.student_name))
+                # Tələbələr əvvəlki ölçülərin qruplarında da ola bilər - yalnız bu qrup sayılır
+                self.assertEqual(len(members.student_name.schedule_ids.filtered(
+                    lambda row: row.group_schedule_id.group_id == group
+                )), size * 3)
+            return lambda: members.write({'status': 'active'}), check
+
+        self.assertQueriesScale('course.group.member activation', 60, (5, 20, 50), scenario)
+
+    def test_payment_create(self):
+        def scenario(size):
+            group = self._create_groups(1, self.teachers)
+            members = self._enroll(group, self.registrations[:size], per_group=size)
+            vals_list = [{'member_id': member.id, 'amount': 100.0} for member in members]
+
+            def check(result):
+                self.assertEqual(set(members.mapped('payment_status')), {'partial'})
+            return lambda: self.env['group.member.payment'].create(vals_list), check
+
+        self.assertQueriesScale('group.member.payment.create', 40, (5, 20, 50), scenario)
+
+    def test_payment_unlink(self):
+        def scenario(size):
+            group = self._create_groups(1, self.teachers)
+            members = self._enroll(group, self.registrations[:size], per_group=size)
+            payments = self.env['group.member.payment'].create([
+                {'member_id': member.id, 'amount': 100.0} for member in members
+            ])
+
+            def check(result):
+                self.assertEqual(set(members.mapped('payment_status')), {'pending'})
+            return payments.unlink, check
+
+        self.assertQueriesScale('group.member.payment.unlink', 40, (5, 20, 50), scenario)
+
+    def test_generate_monthly_salaries(self):
+        month = date(2025, 1, 1)
+
+        def scenario(size):
+            teachers = self._create_teachers(size)
+            groups = self._create_groups(2, teachers)
+            groups.generate_lesson_days()
+            groups.lesson_day_ids.write({'status': 'completed'})
+
+            def check(result):
+                # Əvvəlki ölçülərin müəllimlərinin maaşı artıq var - yalnız yeniləri yaradılır
+                salaries = self.env['teacher.salary'].search([
+                    ('teacher_id', 'in', teachers.ids), ('salary_month', '=', month),
+                ])
+                self.assertEqual(salaries.teacher_id, teachers)
+                for salary in salaries:
+                    expected = self.env['course.group.lesson.day'].search_count([
+                        ('teacher_id', '=', salary.teacher_id.id),
+                        ('status', '=', 'completed'),
+                        ('lesson_date', '>=', month),
+                        ('lesson_date', '<', date(2025, 2, 1)),
+                    ])
+                    self.assertEqual(salary.lesson_count, expected)
+                self.assertTrue(all(
+                    salaries.filtered(lambda s: s.teacher_id in teachers[:2]).mapped('lesson_count')
+                ))
+            return lambda: self.env['teacher.salary'].generate_monthly_salaries(month), check
+
+        self.assertQueriesScale('generate_monthly_salaries', 40, (5, 20, 50), scenario)
+
+    def test_schedule_write_propagation(self):
+        def scenario(size):
+            groups = self._create_groups(size, self.teachers)
+            # Bazar ertəsi hər qrupun ikinci, dəyişməyən dərsi var
+            morning = self.env['course.group.schedule'].create([{
+                'group_id': group.id, 'day_of_week': '0', 'start_time': 8.0, 'end_time': 9.0,
+            } for group in groups])
+            groups.generate_lesson_days()
+            schedules = groups.schedule_ids - morning
+
+            def check(result):
+                lessons = groups.lesson_day_ids
+                self.assertEqual(len(lessons), size * 18)
+                self.assertEqual(set(lessons.mapped('start_time')), {8.0, 10.0})
+                for group in groups:
+                    for monday in set(group.lesson_day_ids.filtered(lambda l: l.day_of_week == '0').mapped('lesson_date')):
+                        self.assertEqual(sorted(group.lesson_day_ids.filtered(
+                            lambda l: l.lesson_date == monday
+                        ).mapped('start_time')), [8.0, 10.0])
+            return lambda: schedules.write({'start_time': 10.0, 'end_time': 11.5}), check
+
+        self.assertQueriesScale('course.group.schedule.write', 60, (2, 5, 10), scenario)
+
+    def _prepare_reschedule(self, size):
+        """İlk dərs günü keçirilmiş, 5 üzvü olan 4 həftəlik qruplar"""
+        groups = self._create_groups(size, self.teachers)
+        self._enroll(groups, self.registrations, per_group=5)
+        groups.generate_lesson_days()
+        completed = groups.lesson_day_ids.filtered(lambda l: l.lesson_date == date(2025, 1, 6))
+        completed.write({'status': 'completed'})
+        return groups, completed
+
+    def test_reschedule_shrink(self):
+        def scenario(size):
+            groups, completed = self._prepare_reschedule(size)
+
+            def check(result):
+                self.assertEqual(len(groups.lesson_day_ids), size * 7)
+                self.assertEqual(groups.lesson_day_ids.filtered(lambda l: l.status == 'completed'), completed)
+            return lambda: groups.write({'number_of_weeks': 2}), check
+
+        self.assertQueriesScale('reschedule (shrink)', 60, (2, 5, 10), scenario)
+
+    def test_reschedule_extend(self):
+        def scenario(size):
+            groups, completed = self._prepare_reschedule(size)
+
+            def check(result):
+                self.assertEqual(len(groups.lesson_day_ids), size * 19)
+                self.assertEqual(len(groups.lesson_day_ids.attendance_list), size * 19 * 5)
+                self.assertEqual(groups.lesson_day_ids.filtered(lambda l: l.status == 'completed'), completed)
+            return lambda: groups.write({'number_of_weeks': 6}), check
+
+        self.assertQueriesScale('reschedule (extend)', 120, (2, 5, 10), scenario)
+
+    def test_update_schedule_from_groups(self):
+        def scenario(size):
+            registration = self._create_registrations(1, prefix=f'Qrafik {size}')
+            groups = self._create_groups(size, self.teachers)
+            self._enroll(groups, registration, per_group=1)
+
+            def check(result):
+                self.assertEqual(len(registration.schedule_ids), size * 3)
+            return registration.update_schedule_from_groups, check
+
+        self.assertQueriesScale('update_schedule_from_groups', 40, (2, 5, 10), scenario)
+
+    def test_group_schedule_change_rebuilds_timetables(self):
+        def scenario(size):
+            registrations = self._create_registrations(size, prefix=f'Cədvəl {size}')
+            groups = self._create_groups(2, self.teachers)
+            # Üzvlərin qrafiki üzvlük yaradılanda qrup qrafikindən avtomatik qurulur
+            self._enroll(groups, registrations, per_group=size)
+            self.assertEqual(len(registrations.schedule_ids), size * 6)
+            self.assertTrue(all(registrations.schedule_ids.mapped('group_schedule_id')))
+            schedules = groups.schedule_ids.filtered(lambda s: s.day_of_week == '0')
+
+            def check(result):
+                monday_rows = registrations.schedule_ids.filtered(lambda s: s.day_of_week == '0')
+                self.assertEqual(len(monday_rows), size * 2)
+                self.assertEqual(set(monday_rows.mapped('start_time')), {8.0})
+
+                schedules.unlink()
+                self.assertEqual(len(registrations.schedule_ids), size * 4)
+            return lambda: schedules.write({'start_time': 8.0, 'end_time': 9.0}), check
+
+        self.assertQueriesScale('course.group.schedule.write (timetable)', 60, (5, 20, 50), scenario)
+
+    def test_registration_import(self):
+        Registration = self.env['edde.course.registration']
+
+        def scenario(size):
+            lines = ['name,email,phone,status,program']
+            lines += [
+                f'Namizəd {size}-{index},import{size}.{index}@example.com,+99455{index:07d},confirmed,Test Program'
+                for index in range(size)
+            ]
+            file_obj = io.StringIO('\n'.join(lines))
+
+            def check(result):
+                self.assertEqual(result['created'], size)
+                registrations = Registration.search([('email', '=like', f'import{size}.%')])
+                self.assertEqual(len(registrations), size)
+                self.assertEqual(len(set(registrations.mapped('student_code'))), size)
+                self.assertEqual(set(registrations.mapped('program')), {self.program})
+                self.assertTrue(all(registrations.mapped('start_date')))
+            return lambda: Registration.import_csv(file_obj, chunk_size=1000), check
+
+        self.assertQueriesScale('edde.course.registration.import_csv', 80, (10, 50, 200), scenario)
+
+    def test_roll_call(self):
+        def scenario(size):
+            group = self._create_groups(1, self.teachers)
+            members = self._enroll(group, self.registrations[:size], per_group=size)
+            group.generate_lesson_days()
+            lesson_day = group.lesson_day_ids[0]
+            present = members[:size // 2]
+
+            def check(sheet):
+                self.assertEqual(len(sheet), size)
+                self.assertEqual({row['member_id'] for row in sheet if row['is_present']}, set(present.ids))
+                self.assertEqual(
+                    set(lesson_day.attendance_list.filtered('is_present').student_id.ids), set(present.ids),
+                )
+            return lambda: lesson_day.set_roll_call(present.ids), check
+
+        self.assertQueriesScale('course.group.lesson.day.set_roll_call', 30, (5, 20, 50), scenario)
+
+    def test_crm_lead_conversion(self):
+        # Tək lead çevrilməsi - sorğu sayı yalnız büdcə ilə yoxlanılır,
+        # həcmlə miqyaslanma test_crm_lead_batch_conversion-dadır
+        lead = self.env['crm.lead'].create({
+            'name': 'Lead',
+            'contact_name': 'Namizəd Lead',
+            'email_from': 'lead@example.com',
+            'phone': '+994500000001',
+        })
+        self._measure('crm.lead conversion', 1, 80, lead.action_create_student_from_lead)
+        self.assertTrue(lead.partner_id)
+        self.assertEqual(
+            self.env['edde.course.registration'].search_count([('student_id', '=', lead.partner_id.id)]),
+            1,
+        )
+
+    def test_crm_lead_batch_conversion(self):
+        def scenario(size):
+            existing = self.env['res.partner'].create({
+                'name': f'Mövcud {size}', 'email': f'batch{size}.0@example.com',
+            })
+            leads = self.env['crm.lead'].create([{
+                'name': f'Toplu Lead {size}-{index}',
+                'contact_name': f'Namizəd {size}-{index}',
+                'email_from': f'batch{size}.{index}@example.com',
+                'phone': f'+99451{size:03d}{index:04d}',
+            } for index in range(size)])
+
+            def check(result):
+                self.assertEqual(leads[0].partner_id, existing)
+                self.assertEqual(len(leads.partner_id), size)
+                self.assertEqual(set(leads.mapped('probability')), {100})
+                self.assertEqual(
+                    self.env['edde.course.registration'].search_count([('student_id', 'in', leads.partner_id.ids)]),
+                    size,
+                )
+            return leads.action_create_students_from_leads, check
+
+        self.assertQueriesScale('crm.lead batch conversion', 120, (5, 20, 50), scenario)
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from ..populate import SIZES, populate
+
+
+@tagged('post_install', '-at_install')
+class TestPopulate(TransactionCase):
+    """Məlumat generatorunun kiçik ölçüdə işlədiyini yoxlayır"""
+
+    def test_populate_small(self):
+        result = populate(self.env, 'small')
+        sizes = SIZES['small']
+        self.assertEqual(len(result['registrations']), sizes['registrations'])
+        self.assertEqual(len(result['groups']), sizes['groups'])
+        self.assertEqual(len(result['members']), sizes['members'])
+        self.assertEqual(len(result['payments']), sizes['payments'])
+        self.assertTrue(result['lesson_days'])
+        self.assertTrue(result['salaries'])
+        self.assertTrue(self.env['course.lesson.attendance'].search_count([
+            ('lesson_day_id', 'in', result['lesson_days'].ids),
+        ]))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(EddeCourseCommon):
+    """Əsas axtarış yollarının kompozit indekslərdən istifadə etdiyini yoxlayır.
+
+    Planlayıcının ardıcıl oxunuşu seçməməsi üçün cədvəllər real həcmə yaxın
+    doldurulur (~5 min dərs günü, ~50 min devamiyyət) və ``ANALYZE`` edilir;
+    hər sorğu üçün gözlənilən konkret indeks yoxlanılır.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(50)
+        cls.registrations = cls._create_registrations(300)
+        cls.groups = cls._create_groups(150, cls.teachers, number_of_weeks=12)
+        cls.groups.generate_lesson_days()
+        cls.members = cls._enroll(cls.groups, cls.registrations, per_group=10)
+
+        lessons = cls.groups.lesson_day_ids
+        lessons.filtered(lambda l: l.lesson_date < date(2025, 3, 1)).write({'status': 'completed'})
+        for month in range(1, 13):
+            cls.env['teacher.salary'].generate_monthly_salaries(date(2025, month, 1))
+
+        cls.env.flush_all()
+        for table in ('course_group_lesson_day', 'course_lesson_attendance', 'course_group_member',
+                      'teacher_salary', 'edde_registration_active_group_rel'):
+            cls.env.cr.execute(SQL('ANALYZE %s', SQL.identifier(table)))
+
+    def _explain(self, model_name, domain):
+        query = self.env[model_name]._search(domain)
+        self.env.cr.execute(SQL('EXPLAIN %s', query.select()))
+        return '\n'.join(row[0] for row in self.env.cr.fetchall())
+
+    def assertIndexScan(self, model_name, domain, index_name):
+        plan = self._explain(model_name, domain)
+        table = self.env[model_name]._table
+        self.assertNotIn(f'Seq Scan on {table}', plan, plan)
+        self.assertIn(index_name, plan, plan)
+
+    def test_lesson_days_by_teacher_date_status(self):
+        self.assertIndexScan('course.group.lesson.day', [
+            ('teacher_id', 'in', self.teachers[:2].ids),
+            ('lesson_date', '>=', date(2025, 1, 1)),
+            ('lesson_date', '<', date(2025, 2, 1)),
+            ('status', '=', 'completed'),
+        ], 'course_group_lesson_day_teacher_date_status_idx')
+
+    def test_lesson_days_by_group(self):
+        self.assertIndexScan('course.group.lesson.day', [
+            ('group_id', 'in', self.groups[:3].ids),
+        ], 'course_group_lesson_day_group_date_idx')
+
+    def test_attendance_by_lesson_day_and_member(self):
+        attendance = self.env['course.lesson.attendance'].search([], limit=1)
+        self.assertIndexScan('course.lesson.attendance', [
+            ('lesson_day_id', '=', attendance.lesson_day_id.id),
+            ('student_id', '=', attendance.student_id.id),
+        ], 'course_lesson_attendance_lesson_day_student_unique')
+
+    def test_attendance_by_member_and_date(self):
+        self.assertIndexScan('course.lesson.attendance', [
+            ('student_id', 'in', self.members[:5].ids),
+            ('lesson_date', '>=', date(2025, 2, 1)),
+        ], 'course_lesson_attendance_student_date_idx')
+
+    def test_members_by_group_and_status(self):
+        self.assertIndexScan('course.group.member', [
+            ('group_id', 'in', self.groups[:3].ids),
+            ('status', '=', 'active'),
+        ], 'course_group_member_group_status_idx')
+
+    def test_active_membership_uniqueness_check(self):
+        member = self.members[0]
+        self.assertIndexScan('course.group.member', [
+            ('student_name', 'in', member.student_name.ids),
+            ('group_id', 'in', member.group_id.ids),
+            ('status', '=', 'active'),
+        ], 'course_group_member_student_group_active_idx')
+
+    def test_salaries_by_teacher_and_month(self):
+        self.assertIndexScan('teacher.salary', [
+            ('teacher_id', 'in', self.teachers[:2].ids),
+            ('salary_month', '=', date(2025, 1, 1)),
+        ], 'teacher_salary_teacher_month_idx')
+
+    def test_registrations_by_active_group(self):
+        plan = self._explain('edde.course.registration', [
+            ('active_groups', 'in', self.groups[:1].ids),
+        ])
+        self.assertNotIn('Seq Scan on edde_registration_active_group_rel', plan, plan)
+        self.assertIn('edde_registration_active_group_rel_group_id_registration_id_idx', plan, plan)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestReceivableAging(EddeCourseCommon):
+    """Borcların yaşlanması hesabatının aralıqlara düzgün bölünməsini yoxlayır"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(1)
+        cls.registrations = cls._create_registrations(5)
+        cls.group = cls._create_groups(1, cls.teachers)
+        cls.members = cls._enroll(cls.group, cls.registrations, per_group=5)
+        cls.members[4].join_date = date(2025, 3, 1)
+
+        Payment = cls.env['group.member.payment']
+        Payment.create([
+            {'member_id': cls.members[1].id, 'amount': 100.0, 'payment_date': date(2025, 3, 20)},
+            {'member_id': cls.members[2].id, 'amount': 300.0, 'payment_date': date(2025, 2, 1)},
+            {'member_id': cls.members[3].id, 'amount': 50.0, 'payment_date': date(2025, 4, 1),
+             'is_confirmed': False},
+        ])
+
+    def test_generate_snapshot(self):
+        Aging = self.env['course.receivable.aging']
+        Aging.generate_snapshot(date(2025, 4, 10))
+        rows = {row.member_id: row for row in Aging.search([])}
+
+        # Tam ödəyən üzv hesabata düşmür
+        self.assertNotIn(self.members[2], rows)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(set(Aging.search([]).mapped('snapshot_date')), {date(2025, 4, 10)})
+
+        no_payment = rows[self.members[0]]
+        self.assertEqual(no_payment.reference_date, date(2025, 1, 6))
+        self.assertEqual(no_payment.days_outstanding, 94)
+        self.assertEqual(no_payment.aging_bucket, '90_plus')
+        self.assertEqual(no_payment.amount_90_plus, 300.0)
+
+        paid_recently = rows[self.members[1]]
+        self.assertEqual(paid_recently.reference_date, date(2025, 3, 20))
+        self.assertEqual(paid_recently.aging_bucket, '0_30')
+        self.assertEqual(paid_recently.amount_0_30, 200.0)
+        self.assertEqual(paid_recently.amount_90_plus, 0.0)
+
+        # Təsdiqlənməmiş ödəniş nəzərə alınmır
+        self.assertEqual(rows[self.members[3]].reference_date, date(2025, 1, 6))
+        self.assertEqual(rows[self.members[3]].aging_bucket, '90_plus')
+
+        self.assertEqual(rows[self.members[4]].days_outstanding, 40)
+        self.assertEqual(rows[self.members[4]].aging_bucket, '31_60')
+        self.assertEqual(rows[self.members[4]].registration_id, self.registrations[4])
+        self.assertEqual(rows[self.members[4]].group_id, self.group)
+
+    def test_snapshot_replaces_previous(self):
+        Aging = self.env['course.receivable.aging']
+        Aging.generate_snapshot(date(2025, 4, 10))
+        count = Aging.generate_snapshot(date(2025, 5, 20))
+        self.assertEqual(count, 4)
+        self.assertEqual(set(Aging.search([]).mapped('snapshot_date')), {date(2025, 5, 20)})
+        member = self.members[1]
+        self.assertEqual(Aging.search([('member_id', '=', member.id)]).aging_bucket, '61_90')
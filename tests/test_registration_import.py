@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import io
+from datetime import date
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestRegistrationImport(EddeCourseCommon):
+    """CSV importunda sətir dəyərlərinin yoxlanılması"""
+
+    def _import(self, *lines):
+        file_obj = io.StringIO('\n'.join(('name,email,status,gender,birth_date',) + lines))
+        return self.env['edde.course.registration'].import_csv(file_obj, chunk_size=2)
+
+    def test_selection_labels_and_dates(self):
+        result = self._import(
+            'Namizəd 1,csv1@example.com,Confirmed,Qadın,2000-02-01',
+            'Namizəd 2,csv2@example.com,Təsdiqləndi,male,01.02.2000',
+            'Namizəd 3,csv3@example.com,,,',
+        )
+        self.assertEqual(result['created'], 3)
+        registrations = self.env['edde.course.registration'].search(
+            [('email', '=like', 'csv_@example.com')], order='email',
+        )
+        self.assertEqual(registrations.mapped('status'), ['confirmed', 'confirmed', 'draft'])
+        self.assertEqual(registrations.mapped('gender'), ['female', 'male', False])
+        self.assertEqual(registrations.mapped('birth_date'), [date(2000, 2, 1), date(2000, 2, 1), False])
+        self.assertTrue(all(registration.message_ids for registration in registrations))
+
+    def test_invalid_value_names_the_row(self):
+        with self.assertRaisesRegex(UserError, 'Sətir 3'):
+            self._import(
+                'Namizəd 4,csv4@example.com,confirmed,male,2000-02-01',
+                'Namizəd 5,csv5@example.com,təsdiq,male,2000-02-01',
+            )
+        with self.assertRaisesRegex(UserError, 'Sətir 2'):
+            self._import('Namizəd 6,csv6@example.com,draft,male,2000/02/01')
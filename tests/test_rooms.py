@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime
+
+from psycopg2 import IntegrityError
+
+from odoo.tests import tagged
+from odoo.tools import mute_logger
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestRooms(EddeCourseCommon):
+    """Otaqların vaxt kəsişməsinin verilənlər bazası səviyyəsində qadağası"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teachers = cls._create_teachers(2)
+        cls.room_a, cls.room_b = cls.env['course.room'].create([
+            {'name': 'Otaq A', 'capacity': 12},
+            {'name': 'Otaq B', 'capacity': 20},
+        ])
+        # 0 və 3 nömrəli qrupların dərsləri eyni saatdadır (18:00-19:00)
+        cls.groups = cls._create_groups(4, cls.teachers)
+        cls.groups.generate_lesson_days()
+
+    def test_room_propagates_to_lessons(self):
+        self.groups[0].schedule_ids.write({'room_id': self.room_a.id})
+        self.assertEqual(self.groups[0].lesson_day_ids.room_id, self.room_a)
+
+    def test_overlapping_booking_is_rejected(self):
+        self.groups[0].schedule_ids.write({'room_id': self.room_a.id})
+        # Toxunan dərslər (19:00-da başlayan) eyni otaqda ola bilər
+        self.groups[1].schedule_ids.write({'room_id': self.room_a.id})
+        self.env.flush_all()
+
+        with self.assertRaises(IntegrityError), mute_logger('odoo.sql_db'):
+            self.groups[3].schedule_ids.write({'room_id': self.room_a.id})
+            self.env.flush_all()
+
+    def test_cancelled_lessons_free_the_room(self):
+        Room = self.env['course.room']
+        self.groups[0].schedule_ids.write({'room_id': self.room_a.id})
+        self.assertNotIn(self.room_a, Room._get_free_rooms(datetime(2025, 1, 6, 18, 0), datetime(2025, 1, 6, 19, 0)))
+
+        self.groups[0].lesson_day_ids.write({'status': 'cancelled'})
+        self.assertIn(self.room_a, Room._get_free_rooms(datetime(2025, 1, 6, 18, 0), datetime(2025, 1, 6, 19, 0)))
+
+        self.groups[3].schedule_ids.write({'room_id': self.room_a.id})
+        self.env.flush_all()
+        self.env.invalidate_all()
+        self.assertEqual(self.groups[3].lesson_day_ids.room_id, self.room_a)
+
+    def test_swap_rooms_in_one_batch(self):
+        # 0 və 3 nömrəli qrupların eyni saatdakı dərsləri otaqlarını dəyişir
+        self.groups[0].schedule_ids.write({'room_id': self.room_a.id})
+        self.groups[3].schedule_ids.write({'room_id': self.room_b.id})
+        lesson_a = self.groups[0].lesson_day_ids[0]
+        lesson_b = self.groups[3].lesson_day_ids[0]
+        self.assertEqual(lesson_a.datetime_start, lesson_b.datetime_start)
+
+        def slot_vals(lesson, room):
+            return {
+                'start_time': lesson.start_time,
+                'end_time': lesson.end_time,
+                'teacher_id': lesson.teacher_id.id,
+                'room_id': room.id,
+            }
+
+        self.env['course.group']._apply_lesson_updates([
+            (lesson_a, slot_vals(lesson_a, self.room_b)),
+            (lesson_b, slot_vals(lesson_b, self.room_a)),
+        ])
+        self.env.invalidate_all()
+        self.assertEqual(lesson_a.room_id, self.room_b)
+        self.assertEqual(lesson_b.room_id, self.room_a)
+
+    def test_two_lines_on_same_weekday(self):
+        group = self.env['course.group'].create({
+            'name': 'İki Dərsli Qrup',
+            'program_id': [(6, 0, self.program.ids)],
+            'course_id': [(6, 0, self.course.ids)],
+            'teacher_id': self.teachers[0].id,
+            'start_date': date(2025, 1, 6),
+            'number_of_weeks': 4,
+            'schedule_ids': [
+                (0, 0, {'day_of_week': '1', 'start_time': 9.0, 'end_time': 10.0, 'room_id': self.room_a.id}),
+                (0, 0, {'day_of_week': '1', 'start_time': 11.0, 'end_time': 12.0, 'room_id': self.room_b.id}),
+            ],
+        })
+        group.generate_lesson_days()
+        line_a, line_b = group.schedule_ids.sorted('start_time')
+
+        def slots():
+            return sorted((l.lesson_date, l.start_time, l.room_id.name) for l in group.lesson_day_ids)
+
+        # Bir sətrin saatı dəyişəndə digər sətrin dərsləri yerində qalır
+        line_b.write({'start_time': 13.0, 'end_time': 14.0})
+        tuesdays = sorted(set(group.lesson_day_ids.mapped('lesson_date')))
+        self.assertEqual(len(tuesdays), 4)
+        self.assertEqual(slots(), sorted(
+            (day, start, room) for day in tuesdays for start, room in ((9.0, 'Otaq A'), (13.0, 'Otaq B'))
+        ))
+
+        # Otaqların yerdəyişməsi də hər dərsi öz sətri ilə aparır
+        line_a.write({'room_id': self.room_b.id})
+        line_b.write({'room_id': self.room_a.id})
+        self.assertEqual(slots(), sorted(
+            (day, start, room) for day in tuesdays for start, room in ((9.0, 'Otaq B'), (13.0, 'Otaq A'))
+        ))
+
+        # Deaktiv edilən sətrin dərsləri digər sətrə köçürülmür
+        line_b.write({'is_active': False})
+        self.assertEqual(slots(), sorted((day, 9.0, 'Otaq B') for day in tuesdays))
+
+    def test_free_rooms(self):
+        self.groups[0].schedule_ids.write({'room_id': self.room_a.id})
+        Room = self.env['course.room']
+        # 2025-01-06 18:00-19:00 - Otaq A 0 nömrəli qrupun dərsi ilə tutulub
+        self.assertEqual(Room._get_free_rooms(datetime(2025, 1, 6, 18, 30), datetime(2025, 1, 6, 19, 30)), self.room_b)
+        self.assertEqual(
+            Room._get_free_rooms(datetime(2025, 1, 6, 19, 0), datetime(2025, 1, 6, 20, 0)),
+            self.room_a | self.room_b,
+        )
+        self.assertEqual(
+            Room._get_free_rooms(datetime(2025, 1, 6, 19, 0), datetime(2025, 1, 6, 20, 0), min_capacity=15),
+            self.room_b,
+        )
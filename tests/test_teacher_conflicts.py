@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestTeacherConflicts(EddeCourseCommon):
+    """Müəllimin üst-üstə düşən dərslərinin aşkarlanması"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.teacher = cls._create_teachers(1)
+        # 0 və 3 nömrəli qrupların dərsləri eyni saatdadır (18:00-19:00),
+        # 1 nömrəli qrupun dərsi isə 19:00-da başlayır - toxunur, amma kəsişmir
+        cls.groups = cls._create_groups(4, cls.teacher)
+        cls.groups.generate_lesson_days()
+
+    def test_find_conflicts(self):
+        LessonDay = self.env['course.group.lesson.day']
+        conflicts = LessonDay._find_teacher_conflicts(date(2025, 1, 1), date(2025, 3, 1))
+        # Hər dərs günündə 0 və 3 nömrəli qruplar arasında bir konflikt
+        self.assertEqual(len(conflicts), 13)
+        conflicting_groups = {
+            frozenset(LessonDay.browse([lesson_id, other_id]).group_id.ids)
+            for _teacher_id, lesson_id, other_id, _start, _end in conflicts
+        }
+        self.assertEqual(conflicting_groups, {frozenset((self.groups[0] | self.groups[3]).ids)})
+
+    def test_cancelled_lessons_are_ignored(self):
+        self.groups[3].lesson_day_ids.write({'status': 'cancelled'})
+        conflicts = self.env['course.group.lesson.day']._find_teacher_conflicts(
+            date(2025, 1, 1), date(2025, 3, 1), self.teacher.ids,
+        )
+        self.assertFalse(conflicts)
+
+    def test_assign_all_teachers_validation(self):
+        group = self.groups[3]
+        group.lesson_day_ids.write({'teacher_id': False})
+        # Yoxlanış olmadan təyinat keçir
+        group.action_assign_all_teachers()
+        group.lesson_day_ids.write({'teacher_id': False})
+        with self.assertRaises(ValidationError):
+            group.with_context(check_teacher_conflicts=True).action_assign_all_teachers()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import EddeCourseCommon
+
+
+@tagged('post_install', '-at_install')
+class TestTeacherSalary(EddeCourseCommon):
+    """Aylıq maaşların yaradılması"""
+
+    def test_monthly_run_skips_salaries_dated_mid_month(self):
+        teachers = self._create_teachers(2)
+        # Formdan yaradılan maaş default olaraq ayın cari gününə düşür
+        existing = self.env['teacher.salary'].create({
+            'teacher_id': teachers[0].id,
+            'salary_month': date(2025, 1, 15),
+        })
+
+        salaries = self.env['teacher.salary'].generate_monthly_salaries(date(2025, 1, 20)).filtered(
+            lambda salary: salary.teacher_id in teachers
+        )
+        self.assertEqual(salaries.teacher_id, teachers[1])
+        self.assertEqual(salaries.salary_month, date(2025, 1, 1))
+        self.assertEqual(
+            self.env['teacher.salary'].search([('teacher_id', 'in', teachers.ids)]),
+            existing | salaries,
+        )
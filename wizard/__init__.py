@@ -0,0 +1,3 @@
+from . import course_group_enroll_wizard
+from . import course_registration_import_wizard
+from . import teacher_conflict_wizard
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+
+
+class CourseGroupEnrollWizard(models.TransientModel):
+    _name = 'course.group.enroll.wizard'
+    _description = 'Qrupa Toplu Tələbə Əlavəsi'
+
+    group_id = fields.Many2one('course.group', string='Qrup', required=True)
+    registration_ids = fields.Many2many(
+        'edde.course.registration', string='Tələbələr', required=True,
+        domain=[('status', 'in', ['confirmed', 'in_progress'])]
+    )
+    join_date = fields.Date(string='Başlama Tarixi', default=fields.Date.today, required=True)
+    payment_plan = fields.Selection([
+        ('full', 'Tam Ödəniş'),
+        ('partial', 'İlkin + Qalıq'),
+        ('installment', 'Taksit'),
+        ('custom', 'Fərdi Plan')
+    ], string='Ödəniş Planı', default='full')
+    total_amount = fields.Float(string='Ümumi Məbləğ')
+    monthly_payment = fields.Float(string='Ödəniş')
+
+    def action_enroll(self):
+        """Seçilmiş tələbələri qrupa əlavə et"""
+        self.ensure_one()
+        members = self.group_id.enroll_registrations(
+            self.registration_ids,
+            join_date=self.join_date,
+            member_vals={
+                'payment_plan': self.payment_plan,
+                'total_amount': self.total_amount,
+                'monthly_payment': self.monthly_payment,
+            },
+        )
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Uğurlu',
+                'message': f'{len(members)} tələbə {self.group_id.name} qrupuna əlavə edildi.',
+                'type': 'success',
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
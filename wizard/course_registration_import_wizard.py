@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+
+from odoo import models, fields
+from odoo.exceptions import UserError
+
+
+class CourseRegistrationImportWizard(models.TransientModel):
+    _name = 'edde.registration.import.wizard'
+    _description = 'Qeydiyyatların CSV İmportu'
+
+    file = fields.Binary(string='CSV Faylı', required=True, attachment=True)
+    filename = fields.Char(string='Fayl Adı')
+    delimiter = fields.Selection([
+        (',', 'Vergül (,)'),
+        (';', 'Nöqtəli vergül (;)'),
+    ], string='Ayırıcı', default=',', required=True)
+    chunk_size = fields.Integer(string='Hissə Ölçüsü', default=1000, required=True,
+                                help='Bir dəfəyə yaradılan qeydiyyat sayı')
+
+    def action_import(self):
+        """Faylı hissə-hissə idxal et"""
+        self.ensure_one()
+        if self.chunk_size <= 0:
+            raise UserError("Hissə ölçüsü müsbət olmalıdır!")
+
+        file_obj = io.TextIOWrapper(self._open_file(), encoding='utf-8-sig')
+        try:
+            result = self.env['edde.course.registration'].import_csv(
+                file_obj, chunk_size=self.chunk_size, delimiter=self.delimiter,
+            )
+        except (csv.Error, UnicodeDecodeError) as error:
+            raise UserError(f"Fayl oxuna bilmədi: {error}")
+        finally:
+            file_obj.close()
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Uğurlu',
+                'message': f"{result['created']} qeydiyyat {result['chunks']} hissədə "
+                           f"{result['duration']:.1f} saniyəyə idxal edildi.",
+                'type': 'success',
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
+
+    def _open_file(self):
+        """Yüklənmiş faylı ikili axın kimi aç.
+
+        Fayl diskdə saxlanılırsa birbaşa fayl sistemindən oxunur və yaddaşa
+        yalnız import_csv-nin hissə ölçüsü qədər sətir düşür. Verilənlər
+        bazasında saxlanılan əlavə isə bütövlükdə yaddaşa yüklənir - bu halda
+        yaddaş istifadəsi fayl ölçüsü qədərdir.
+        """
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('res_field', '=', 'file'),
+        ], limit=1)
+        if not attachment:
+            raise UserError("Yüklənmiş fayl tapılmadı!")
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(attachment.raw)
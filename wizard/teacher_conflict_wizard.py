@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from dateutil.relativedelta import relativedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+class TeacherConflictWizard(models.TransientModel):
+    _name = 'teacher.conflict.wizard'
+    _description = 'Müəllim Dərs Konfliktləri'
+
+    date_from = fields.Date(string='Başlanğıc Tarix', required=True, default=fields.Date.today)
+    date_to = fields.Date(
+        string='Son Tarix', required=True,
+        default=lambda self: fields.Date.today() + relativedelta(months=1),
+    )
+    teacher_ids = fields.Many2many(
+        'res.partner', string='Müəllimlər', domain=[('is_teacher', '=', True)],
+        help='Boş qalarsa bütün müəllimlər yoxlanılır',
+    )
+    line_ids = fields.One2many('teacher.conflict.wizard.line', 'wizard_id', string='Konfliktlər')
+    conflict_count = fields.Integer(string='Konflikt Sayı', compute='_compute_conflict_count')
+
+    @api.depends('line_ids')
+    def _compute_conflict_count(self):
+        for wizard in self:
+            wizard.conflict_count = len(wizard.line_ids)
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise ValidationError("Başlanğıc tarix son tarixdən böyük ola bilməz!")
+
+    def action_find_conflicts(self):
+        """Seçilmiş aralıqda konfliktləri tap və nəticəni göstər"""
+        self.ensure_one()
+        conflicts = self.env['course.group.lesson.day']._find_teacher_conflicts(
+            self.date_from, self.date_to, self.teacher_ids.ids,
+        )
+        self.line_ids = [(5, 0, 0)] + [(0, 0, {
+            'teacher_id': teacher_id,
+            'lesson_id': lesson_id,
+            'conflicting_lesson_id': other_id,
+            'overlap_start': overlap_start,
+            'overlap_end': overlap_end,
+        }) for teacher_id, lesson_id, other_id, overlap_start, overlap_end in conflicts]
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Müəllim Dərs Konfliktləri',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+
+class TeacherConflictWizardLine(models.TransientModel):
+    _name = 'teacher.conflict.wizard.line'
+    _description = 'Müəllim Dərs Konflikti'
+    _order = 'teacher_id, overlap_start'
+
+    wizard_id = fields.Many2one('teacher.conflict.wizard', required=True, ondelete='cascade')
+    teacher_id = fields.Many2one('res.partner', string='Müəllim', readonly=True)
+    lesson_id = fields.Many2one('course.group.lesson.day', string='Dərs', readonly=True)
+    group_id = fields.Many2one(related='lesson_id.group_id', string='Qrup')
+    conflicting_lesson_id = fields.Many2one('course.group.lesson.day', string='Üst-üstə Düşən Dərs', readonly=True)
+    conflicting_group_id = fields.Many2one(related='conflicting_lesson_id.group_id', string='Digər Qrup')
+    overlap_start = fields.Datetime(string='Kəsişmə Başlanğıcı', readonly=True)
+    overlap_end = fields.Datetime(string='Kəsişmə Sonu', readonly=True)